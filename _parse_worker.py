@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Pure HTML-to-product-fields extraction for samsung_product_scraper.
+
+Everything here is free of event-loop and scraper state so it can run inside
+a ProcessPoolExecutor: parse_html() takes raw HTML plus the page URL and
+returns a plain dict of ProductRecord fields (or None). Keeping the heavy
+parsing in worker processes stops it from blocking the asyncio thread.
+"""
+
+import json
+import logging
+import re
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+# selectolax parses HTML in C (Modest engine) and is typically an order of
+# magnitude faster than bs4's pure-Python parser; fall back when missing
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# orjson decodes typical 10-50KB schema.org payloads 2-3x faster than the
+# stdlib decoder; fall back to json when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(text):
+    """Decode a JSON document with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+_JSON_DECODE_ERRORS = (json.JSONDecodeError,) if orjson is None else (json.JSONDecodeError, orjson.JSONDecodeError)
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.samsung.com/uk"
+
+# Translation table deleting currency symbols and whitespace from price text;
+# str.translate walks the string once in C, with no regex machinery
+_PRICE_STRIP = str.maketrans('', '', '£$€,\t\n\r ')
+
+# Samsung UK specific CSS selectors, built once at import; ordered
+# most-specific first
+NAME_SELECTORS = (
+    'h1[data-testid="pdp-product-name"]',
+    'h1.pdp-product-name',
+    'h1.product-title',
+    '.product-name h1',
+    '.pdp-product-name',
+    'h1[class*="product"]',
+    'h1[id*="product"]',
+)
+
+PRICE_SELECTORS = (
+    '[data-testid="price-current"]',
+    '.price-current',
+    '.current-price',
+    '.price .current',
+    '.product-price .current',
+    '.price-value',
+    '[class*="price"][class*="current"]',
+)
+
+IMAGE_SELECTORS = (
+    '.pdp-gallery img[src]',
+    '.product-image img[src]',
+    '.hero-image img[src]',
+    '.product-gallery img[src]',
+    '.main-image img[src]',
+    '[data-testid="pdp-gallery"] img[src]',
+)
+
+SKU_SELECTORS = (
+    '[data-testid="model-code"]',
+    '.model-code',
+    '.product-sku',
+    '.sku-value',
+    '[class*="model-code"]',
+    '[id*="model-code"]',
+)
+
+DESCRIPTION_SELECTORS = (
+    '.product-description',
+    '.pdp-description',
+    '.product-overview',
+    '[data-testid="product-description"]',
+    '.product-details p',
+)
+
+AVAILABILITY_SELECTORS = (
+    '.availability-status',
+    '.stock-status',
+    '[data-testid="availability"]',
+    '.product-availability',
+)
+
+
+def parse_price(v) -> Optional[float]:
+    """Coerce a raw price value (string with currency symbols, number) to float"""
+    if v is None:
+        return None
+    if isinstance(v, str):
+        # Remove currency symbols and convert to float
+        try:
+            return float(v.translate(_PRICE_STRIP))
+        except ValueError:
+            return None
+    return float(v) if v else None
+
+
+def parse_tree(html: str):
+    """Parse HTML with selectolax when available, bs4+lxml otherwise"""
+    if HTMLParser is not None:
+        return HTMLParser(html)
+    return BeautifulSoup(html, 'lxml')
+
+
+def _json_ld_scripts(tree) -> List[str]:
+    """Return the text of every JSON-LD script in the document"""
+    if HTMLParser is not None and isinstance(tree, HTMLParser):
+        return [node.text() for node in tree.css('script[type="application/ld+json"]')]
+    return [s.string for s in tree.find_all('script', type='application/ld+json')]
+
+
+def _extract_text_by_selectors(tree, selectors) -> Optional[str]:
+    """Extract text using list of CSS selectors"""
+    selectolax_tree = HTMLParser is not None and isinstance(tree, HTMLParser)
+    for selector in selectors:
+        try:
+            if selectolax_tree:
+                node = tree.css_first(selector)
+                text = node.text(strip=True) if node else None
+            else:
+                element = tree.select_one(selector)
+                text = element.get_text(strip=True) if element else None
+            if text:
+                return text
+        except Exception:
+            continue
+    return None
+
+
+def _extract_attr_by_selectors(tree, selectors, attr: str) -> Optional[str]:
+    """Extract attribute using list of CSS selectors"""
+    selectolax_tree = HTMLParser is not None and isinstance(tree, HTMLParser)
+    for selector in selectors:
+        try:
+            if selectolax_tree:
+                node = tree.css_first(selector)
+                value = node.attributes.get(attr) if node else None
+            else:
+                element = tree.select_one(selector)
+                value = element.get(attr) if element else None
+            if value:
+                return value
+        except Exception:
+            continue
+    return None
+
+
+def _extract_category_from_url(url: str) -> Optional[str]:
+    """Extract category from URL path"""
+    try:
+        path = urlparse(url).path.strip('/')
+        parts = path.split('/')
+
+        # Skip language/region parts
+        if len(parts) > 0 and parts[0] == 'uk':
+            parts = parts[1:]
+
+        # Return first meaningful category
+        if parts and parts[0] not in ['buy', 'product']:
+            return parts[0].replace('-', ' ').title()
+    except Exception:
+        pass
+    return None
+
+
+def fields_from_json_ld(data: dict, url: str) -> Optional[dict]:
+    """Build ProductRecord field values from a JSON-LD Product node"""
+    try:
+        # Extract offers data
+        offers = data.get('offers', {})
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+
+        # Extract image
+        image = data.get('image')
+        if isinstance(image, list):
+            image = image[0] if image else None
+        if isinstance(image, dict):
+            image = image.get('url', image.get('@id'))
+
+        # Make image URL absolute
+        if image and image.startswith('/'):
+            image = BASE_URL + image
+
+        # Extract category information; take the second element before
+        # unwrapping the first, otherwise the index lands on the unwrapped
+        # string (['TVs', ...] would yield sub_category 'V') and an empty
+        # list would raise on len(None)
+        category = data.get('category')
+        sub_category = None
+        if isinstance(category, list):
+            sub_category = category[1] if len(category) > 1 else None
+            category = category[0] if category else None
+
+        # Extract description
+        description = data.get('description', data.get('text', ''))
+        if isinstance(description, list):
+            description = ' '.join(description)
+
+        return dict(
+            url=url,
+            sku=data.get('sku', data.get('mpn', data.get('productID'))),
+            name=data.get('name', ''),
+            category=category,
+            sub_category=sub_category,
+            price_gbp=parse_price(offers.get('price')),
+            currency=offers.get('priceCurrency', 'GBP'),
+            availability=offers.get('availability', '').replace('https://schema.org/', ''),
+            image_url=image,
+            description=description[:500] if description else None,  # Limit description length
+            model_code=data.get('model', data.get('modelCode', data.get('mpn')))
+        )
+
+    except Exception as e:
+        logger.debug(f"Error creating product from JSON-LD: {e}")
+        return None
+
+
+def fields_from_json_ld_scripts(tree, url: str) -> Optional[dict]:
+    """Extract product fields from JSON-LD structured data"""
+    try:
+        for script_text in _json_ld_scripts(tree):
+            if not script_text:
+                continue
+
+            try:
+                data = _loads(script_text)
+
+                # Handle different JSON-LD structures
+                if isinstance(data, list):
+                    for item in data:
+                        if item.get('@type') == 'Product':
+                            return fields_from_json_ld(item, url)
+                elif data.get('@type') == 'Product':
+                    return fields_from_json_ld(data, url)
+                elif 'product' in data:
+                    product_data = data['product']
+                    if isinstance(product_data, dict):
+                        return fields_from_json_ld(product_data, url)
+
+            except (*_JSON_DECODE_ERRORS, KeyError) as e:
+                logger.debug(f"JSON-LD parsing error for {url}: {e}")
+                continue
+
+    except Exception as e:
+        logger.debug(f"JSON-LD extraction failed for {url}: {e}")
+
+    return None
+
+
+def fields_from_css_selectors(tree, url: str) -> Optional[dict]:
+    """Extract product fields using CSS selectors as fallback"""
+    try:
+        # Extract data using the module-level selector tables
+        name = _extract_text_by_selectors(tree, NAME_SELECTORS)
+        price_text = _extract_text_by_selectors(tree, PRICE_SELECTORS)
+        image_url = _extract_attr_by_selectors(tree, IMAGE_SELECTORS, 'src')
+        sku = _extract_text_by_selectors(tree, SKU_SELECTORS)
+        description = _extract_text_by_selectors(tree, DESCRIPTION_SELECTORS)
+        availability = _extract_text_by_selectors(tree, AVAILABILITY_SELECTORS)
+
+        # If no name found, try title tag
+        if not name:
+            title_text = _extract_text_by_selectors(tree, ['title'])
+            if title_text:
+                name = title_text.split('|')[0].strip()
+
+        if not name:
+            logger.debug(f"No product name found for {url}")
+            return None
+
+        # Parse price; the DOM text may carry labels ("From £1,099.00")
+        # so fall back to keeping digits and dots when translate alone
+        # does not yield a parseable number
+        price_gbp = None
+        if price_text:
+            try:
+                price_gbp = float(price_text.translate(_PRICE_STRIP))
+            except ValueError:
+                price_cleaned = ''.join(c for c in price_text if c.isdigit() or c == '.')
+                try:
+                    price_gbp = float(price_cleaned) if price_cleaned else None
+                except ValueError:
+                    pass
+
+        # Make image URL absolute
+        if image_url and image_url.startswith('/'):
+            image_url = BASE_URL + image_url
+
+        # Extract category from URL
+        category = _extract_category_from_url(url)
+
+        return dict(
+            url=url,
+            sku=sku,
+            name=name,
+            category=category,
+            price_gbp=price_gbp,
+            currency='GBP',
+            availability=availability,
+            image_url=image_url,
+            description=description[:500] if description else None,
+            model_code=sku
+        )
+
+    except Exception as e:
+        logger.debug(f"CSS selector extraction failed for {url}: {e}")
+        return None
+
+
+# Byte-level locator for JSON-LD scripts: a C-accelerated regex over the raw
+# response finds them far faster than building a DOM ever could
+_JSONLD_RE = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def fields_from_raw_jsonld(raw: bytes, url: str) -> Optional[dict]:
+    """Fast path: pull product fields straight from raw bytes, no DOM parse"""
+    for match in _JSONLD_RE.finditer(raw):
+        try:
+            data = _loads(match.group(1).strip())
+        except Exception:
+            continue
+        
+        candidates = data if isinstance(data, list) else [data]
+        for item in candidates:
+            if not isinstance(item, dict):
+                continue
+            if item.get('@type') == 'Product':
+                fields = fields_from_json_ld(item, url)
+            elif isinstance(item.get('product'), dict):
+                fields = fields_from_json_ld(item['product'], url)
+            else:
+                continue
+            if fields:
+                return fields
+    return None
+
+
+def parse_html(html: str, url: str) -> Optional[dict]:
+    """Full extraction pipeline over raw HTML; safe to run in a worker process"""
+    tree = parse_tree(html)
+
+    # Try JSON-LD first (most reliable)
+    fields = fields_from_json_ld_scripts(tree, url)
+    if fields:
+        return fields
+
+    # Fall back to CSS selectors
+    return fields_from_css_selectors(tree, url)
@@ -15,7 +15,10 @@ import json
 import logging
 import re
 import argparse
+import time
+from collections import deque
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Set, Dict, Optional
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
@@ -24,6 +27,27 @@ import aiohttp
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 
+# orjson serializes small dicts several times faster than json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow's compute kernels filter whole URL batches in one C pass; optional
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# selectolax's Lexbor backend parses HTML in C, far faster than
+# BeautifulSoup; fall back to bs4 when it isn't installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,15 +60,194 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
+_ORIGIN = "https://www.samsung.com"
 BASE_URL = "https://www.samsung.com/uk"
 USER_AGENT = "Samsung-UK-URL-Expansion/1.0 (contact: scraper@example.com)"
 
+# URL classification patterns, compiled once into single alternations so each
+# URL costs one C-level regex scan instead of a Python loop over patterns
+_CATEGORY_LISTING_PATTERNS = [
+    r'/all-[^/]+/?$',  # URLs like /all-watches/, /all-smartphones/
+    r'/(smartphones|tablets|watches|audio-sound|galaxy-buds|computers|galaxy-book|home-appliances|tvs|monitors|refrigerators|dishwashers|cooking-appliances|vacuum-cleaners|memory-storage|audio-devices)/?$',  # Category root pages
+    r'/[^/]+/[^/]+/$',  # Two-level category pages
+]
+
+_CATEGORY_EXCLUDE_PATTERNS = [
+    r'/[^/]+-[a-z]{2}-[a-z0-9]+/',  # Model codes like -sm-r630nzaaeua
+    r'/[a-z]{2}\d+[a-z0-9]+/',  # Model patterns like qe65s95fatxxu
+    r'/hw-[a-z0-9]+/',  # Audio hardware codes
+    r'/np\d+[a-z]+/',  # Laptop model codes
+    r'/vs\d+[a-z]+/',  # Vacuum model codes
+    r'/buying-guide/',  # Buying guides
+    r'/learn/',  # Learning pages
+    r'/compare/',  # Comparison pages
+]
+
+_PRODUCT_PATTERNS = [
+    # Samsung model patterns
+    r'/[^/]+-[a-z]{2}-[a-z0-9]{10,}/',  # Model codes like -sm-r630nzaaeua
+    r'/qe\d+[a-z]+\d+[a-z]+/',  # TV models like qe65s95fatxxu
+    r'/ls\d+[a-z]+\d+[a-z]+/',  # Monitor/TV model codes
+    r'/hw-[a-z0-9]+/',  # Audio hardware codes like hw-q990d-xu
+    r'/np\d+[a-z]+-[a-z0-9]+/',  # Laptop model codes
+    r'/vs\d+[a-z]+\d+[a-z]+/',  # Vacuum model codes
+    r'/sm-[a-z0-9]+-[a-z]+/',  # Galaxy device codes
+    r'/ww\d+[a-z]+\d+[a-z]+/',  # Washer model codes
+    r'/rl\d+[a-z]+\d+[a-z]+/',  # Refrigerator codes
+
+    # Product name patterns with specifications
+    r'/[^/]+-\d+[^/]*-inch-[^/]+/',  # Size specifications like 65-inch, 27-inch
+    r'/[^/]+-\d+hz-[^/]+/',  # Frequency specifications like 240hz
+    r'/[^/]+-\d+gb-[^/]+/',  # Memory specifications like 16gb
+    r'/[^/]+-ultra-[^/]+/',  # Ultra model variations
+    r'/[^/]+-pro-[^/]+/',  # Pro model variations
+    r'/galaxy-[^/]+-[^/]+-[^/]+/',  # Galaxy product with specifications
+    r'/bespoke-[^/]+-[^/]+/',  # Bespoke appliance models
+]
+
+_PRODUCT_EXCLUDE_PATTERNS = [
+    r'/all-',  # Category listing pages
+    r'/buying-guide/',
+    r'/learn/',
+    r'/compare/',
+    r'/highlights/',
+    r'/why-',
+    r'/$',  # URLs ending with just slash (category pages)
+]
+
+def _compile_union(patterns: List[str]) -> re.Pattern:
+    """Compile a list of patterns into a single alternation"""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+# Resource types and third-party hosts that never contribute product URLs
+_BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+_BLOCKED_URL_SUBSTRINGS = (
+    'google-analytics', 'googletagmanager', 'doubleclick',
+    'facebook.net', 'adobedtm', 'hotjar'
+)
+
+_CATEGORY_INCLUDE_RE = _compile_union(_CATEGORY_LISTING_PATTERNS)
+_CATEGORY_EXCLUDE_RE = _compile_union(_CATEGORY_EXCLUDE_PATTERNS)
+_PRODUCT_INCLUDE_RE = _compile_union(_PRODUCT_PATTERNS)
+_PRODUCT_EXCLUDE_RE = _compile_union(_PRODUCT_EXCLUDE_PATTERNS)
+
+# The same hrefs recur across many category pages, so classification is
+# memoized at module level (lru_cache on instance methods would leak self)
+@lru_cache(maxsize=200_000)
+def _is_samsung_uk_url(url: str) -> bool:
+    return url.startswith(BASE_URL) and '/uk/' in url
+
+@lru_cache(maxsize=200_000)
+def _is_category_listing_url(url: str) -> bool:
+    return (bool(_CATEGORY_INCLUDE_RE.search(url)) and
+            not _CATEGORY_EXCLUDE_RE.search(url))
+
+@lru_cache(maxsize=200_000)
+def _is_individual_product_url(url: str) -> bool:
+    return (bool(_PRODUCT_INCLUDE_RE.search(url)) and
+            not _PRODUCT_EXCLUDE_RE.search(url))
+
+@lru_cache(maxsize=200_000)
+def _is_likely_product_url_cached(url: str) -> bool:
+    has_product_pattern = any(pattern in url for pattern in ('-sm-', '-qe-', '-hw-', '-np-', '-ls-', '-xe-'))
+    has_category = any(cat in url for cat in ('/smartphones/', '/computers/', '/tvs/', '/audio', '/monitors/', '/tablets/'))
+
+    # Quick exclusion check
+    excludes = ('#', '/all-', '/buy', '/compare', '/support', '/?')
+    is_excluded = any(exc in url for exc in excludes)
+
+    return has_product_pattern and has_category and not is_excluded
+
+# Combined alternation with named groups: one scan tells us which bucket a
+# URL can fall into, so the common no-match case costs a single regex pass
+_CLASSIFY_RE = re.compile('|'.join(
+    [f'(?P<cat{i}>{p})' for i, p in enumerate(_CATEGORY_LISTING_PATTERNS)] +
+    [f'(?P<prod{i}>{p})' for i, p in enumerate(_PRODUCT_PATTERNS)]
+))
+
+@lru_cache(maxsize=200_000)
+def _classify_url(url: str) -> Optional[str]:
+    """Classify a URL as 'category', 'product' or None in one main scan.
+
+    Category classification keeps precedence over product, matching the
+    original is_category_listing_url-then-is_individual_product_url order.
+    """
+    m = _CLASSIFY_RE.search(url)
+    if not m:
+        return None
+
+    if m.lastgroup.startswith('cat'):
+        if not _CATEGORY_EXCLUDE_RE.search(url):
+            return 'category'
+        # Category hit was excluded; the URL may still be a product
+        if _PRODUCT_INCLUDE_RE.search(url) and not _PRODUCT_EXCLUDE_RE.search(url):
+            return 'product'
+        return None
+
+    # A product pattern matched first; category still takes precedence
+    if _CATEGORY_INCLUDE_RE.search(url) and not _CATEGORY_EXCLUDE_RE.search(url):
+        return 'category'
+    if not _PRODUCT_EXCLUDE_RE.search(url):
+        return 'product'
+    return None
+
+def _clear_url_caches():
+    """Release classification cache memory between runs"""
+    for fn in (_is_samsung_uk_url, _is_category_listing_url,
+               _is_individual_product_url, _is_likely_product_url_cached,
+               _classify_url):
+        fn.cache_clear()
+
+class HostRateLimiter:
+    """Token-bucket style pacing for a single host with 429/503 backoff.
+
+    Replaces the fixed post-category sleep: requests flow at full speed
+    while Samsung is happy and back off exponentially when it throttles.
+    """
+
+    def __init__(self, max_concurrent: int = 16, min_interval: float = 0.25):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.min_interval = min_interval
+        self.recent = deque(maxlen=64)
+        self.backoff_until = 0.0
+        self.attempt = 0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            wait = max(self.backoff_until - now, 0.0)
+            if self.recent:
+                wait = max(wait, self.recent[-1] + self.min_interval - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.recent.append(time.monotonic())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.semaphore.release()
+
+    def note_throttled(self, retry_after: Optional[float] = None):
+        """Back off exponentially after a 429/503 (or honour Retry-After)"""
+        self.attempt = min(self.attempt + 1, 6)
+        delay = retry_after if retry_after else 2 ** self.attempt
+        self.backoff_until = time.monotonic() + delay
+        logger.warning(f"Rate limited; backing off for {delay:.0f}s")
+
+    def note_success(self):
+        self.attempt = 0
+
+
 class ProductURLExpander:
     def __init__(self, concurrency: int = 3):
         self.concurrency = concurrency
         self.session: Optional[aiohttp.ClientSession] = None
         self.playwright = None
-        self.browser = None
+        self._contexts: List = []
+        self._ctx_rr = 0  # round-robin cursor over shared contexts
+        self._dom_watch: Dict = {}  # page -> MutationObserver state
+        self.rate_limiter = HostRateLimiter()
         
         # URL tracking
         self.input_urls: Set[str] = set()
@@ -52,8 +255,9 @@ class ProductURLExpander:
         self.individual_urls: Set[str] = set()
         self.expanded_urls: Set[str] = set()
         
-        # Metadata tracking
-        self.expansion_metadata: Dict[str, Dict] = {}
+        # Metadata is streamed to JSONL as URLs are discovered
+        self._meta_fp = None
+        self._meta_seen: Set[str] = set()
         
         # Stats
         self.stats = {
@@ -77,98 +281,102 @@ class ProductURLExpander:
             headers=headers
         )
         
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        
+        self._meta_fp = open('expansion_metadata.jsonl', 'w', encoding='utf-8')
+
+        # The browser is launched lazily: runs whose input is already fully
+        # expanded (or covered by sitemaps) never pay Chromium's startup cost
         return self
 
+    async def _ensure_browser(self):
+        """Launch the persistent browser context on first use"""
+        if self._contexts:
+            return
+
+        self.playwright = await async_playwright().start()
+
+        # A persistent context keeps Chromium's HTTP cache, service workers
+        # and compiled-code caches on disk, so repeat runs skip redownloading
+        # Samsung's ~2 MB of JS/CSS per page; pages are created directly on it
+        context = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=str(Path('.pw-cache').absolute()),
+            headless=True,
+            user_agent=USER_AGENT,
+            viewport={'width': 1366, 'height': 900},
+            java_script_enabled=True,
+            bypass_csp=True,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        # Abort requests for bytes we never look at; keep script/xhr/fetch
+        # because Samsung's "View more" pagination depends on them
+        await context.route("**/*", self._route_filter)
+        self._contexts.append(context)
+
+    def _next_context(self):
+        """Round-robin over the shared contexts; pages are cheap per context"""
+        context = self._contexts[self._ctx_rr % len(self._contexts)]
+        self._ctx_rr += 1
+        return context
+
+    @staticmethod
+    async def _route_filter(route):
+        """Abort image/media/font/stylesheet and analytics requests"""
+        request = route.request
+        if (request.resource_type in _BLOCKED_RESOURCE_TYPES or
+                any(host in request.url for host in _BLOCKED_URL_SUBSTRINGS)):
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._meta_fp:
+            self._meta_fp.close()
+            self._meta_fp = None
         if self.session:
             await self.session.close()
-        if self.browser:
-            await self.browser.close()
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
         if self.playwright:
             await self.playwright.stop()
+        _clear_url_caches()
 
     def is_samsung_uk_url(self, url: str) -> bool:
         """Check if URL belongs to Samsung UK"""
-        return url.startswith(BASE_URL) and '/uk/' in url
+        return _is_samsung_uk_url(url)
 
     def is_category_listing_url(self, url: str) -> bool:
         """Check if URL is a category listing page that should be expanded"""
-        category_listing_patterns = [
-            r'/all-[^/]+/?$',  # URLs like /all-watches/, /all-smartphones/
-            r'/(smartphones|tablets|watches|audio-sound|galaxy-buds|computers|galaxy-book|home-appliances|tvs|monitors|refrigerators|dishwashers|cooking-appliances|vacuum-cleaners|memory-storage|audio-devices)/?$',  # Category root pages
-            r'/[^/]+/[^/]+/$',  # Two-level category pages
-        ]
-        
-        # Exclude already specific product pages
-        exclude_patterns = [
-            r'/[^/]+-[a-z]{2}-[a-z0-9]+/',  # Model codes like -sm-r630nzaaeua
-            r'/[a-z]{2}\d+[a-z0-9]+/',  # Model patterns like qe65s95fatxxu
-            r'/hw-[a-z0-9]+/',  # Audio hardware codes
-            r'/np\d+[a-z]+/',  # Laptop model codes
-            r'/vs\d+[a-z]+/',  # Vacuum model codes
-            r'/buying-guide/',  # Buying guides
-            r'/learn/',  # Learning pages
-            r'/compare/',  # Comparison pages
-        ]
-        
-        is_category = any(re.search(pattern, url) for pattern in category_listing_patterns)
-        is_excluded = any(re.search(pattern, url) for pattern in exclude_patterns)
-        
-        return is_category and not is_excluded
+        return _is_category_listing_url(url)
 
     def is_individual_product_url(self, url: str) -> bool:
         """Check if URL is an individual product page"""
-        product_patterns = [
-            # Samsung model patterns
-            r'/[^/]+-[a-z]{2}-[a-z0-9]{10,}/',  # Model codes like -sm-r630nzaaeua
-            r'/qe\d+[a-z]+\d+[a-z]+/',  # TV models like qe65s95fatxxu
-            r'/ls\d+[a-z]+\d+[a-z]+/',  # Monitor/TV model codes
-            r'/hw-[a-z0-9]+/',  # Audio hardware codes like hw-q990d-xu
-            r'/np\d+[a-z]+-[a-z0-9]+/',  # Laptop model codes
-            r'/vs\d+[a-z]+\d+[a-z]+/',  # Vacuum model codes
-            r'/sm-[a-z0-9]+-[a-z]+/',  # Galaxy device codes
-            r'/ww\d+[a-z]+\d+[a-z]+/',  # Washer model codes
-            r'/rl\d+[a-z]+\d+[a-z]+/',  # Refrigerator codes
-            
-            # Product name patterns with specifications
-            r'/[^/]+-\d+[^/]*-inch-[^/]+/',  # Size specifications like 65-inch, 27-inch
-            r'/[^/]+-\d+hz-[^/]+/',  # Frequency specifications like 240hz
-            r'/[^/]+-\d+gb-[^/]+/',  # Memory specifications like 16gb
-            r'/[^/]+-ultra-[^/]+/',  # Ultra model variations
-            r'/[^/]+-pro-[^/]+/',  # Pro model variations
-            r'/galaxy-[^/]+-[^/]+-[^/]+/',  # Galaxy product with specifications
-            r'/bespoke-[^/]+-[^/]+/',  # Bespoke appliance models
-        ]
-        
-        # Exclude general pages
-        exclude_patterns = [
-            r'/all-',  # Category listing pages
-            r'/buying-guide/',
-            r'/learn/',
-            r'/compare/',
-            r'/highlights/',
-            r'/why-',
-            r'/$',  # URLs ending with just slash (category pages)
-        ]
-        
-        is_product = any(re.search(pattern, url) for pattern in product_patterns)
-        is_excluded = any(re.search(pattern, url) for pattern in exclude_patterns)
-        
-        return is_product and not is_excluded
+        return _is_individual_product_url(url)
+
+    @staticmethod
+    def _iter_input_urls(input_file: str):
+        """Stream Samsung UK URLs from a file one line at a time.
+
+        Reads in bytes mode and only decodes lines whose prefix matches,
+        so large multi-stage URL files never get slurped into memory.
+        """
+        prefix = BASE_URL.encode()
+        with open(input_file, 'rb') as f:
+            for line in f:
+                raw = line.rstrip(b'\r\n')
+                if not raw.startswith(prefix):
+                    continue
+                url = raw.decode('utf-8')
+                if _is_samsung_uk_url(url):
+                    yield url
 
     async def load_input_urls(self, input_file: str):
         """Load URLs from input file"""
         logger.info(f"Loading URLs from {input_file}")
-        
-        with open(input_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                url = line.strip()
-                if url and self.is_samsung_uk_url(url):
-                    self.input_urls.add(url)
-        
+
+        self.input_urls.update(self._iter_input_urls(input_file))
+
         self.stats['input_urls_count'] = len(self.input_urls)
         logger.info(f"Loaded {len(self.input_urls)} URLs from input file")
 
@@ -177,10 +385,11 @@ class ProductURLExpander:
         logger.info("Categorizing input URLs...")
         
         for url in self.input_urls:
-            if self.is_category_listing_url(url):
+            bucket = _classify_url(url)
+            if bucket == 'category':
                 self.category_urls.add(url)
                 logger.debug(f"Category URL: {url}")
-            elif self.is_individual_product_url(url):
+            elif bucket == 'product':
                 self.individual_urls.add(url)
                 logger.debug(f"Individual product URL: {url}")
             else:
@@ -193,15 +402,124 @@ class ProductURLExpander:
         logger.info(f"Identified {len(self.category_urls)} category listing URLs")
         logger.info(f"Identified {len(self.individual_urls)} individual product URLs")
 
+    def _collect_product_urls_from_json(self, data, product_urls: Set[str]):
+        """Recursively walk a JSON payload collecting product page URLs"""
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key in ('pdpUrl', 'url', 'link', 'href') and isinstance(value, str):
+                    full_url = urljoin(BASE_URL, value) if value.startswith('/') else value
+                    if (self.is_samsung_uk_url(full_url) and
+                        self.is_individual_product_url(full_url)):
+                        product_urls.add(full_url)
+                else:
+                    self._collect_product_urls_from_json(value, product_urls)
+        elif isinstance(data, list):
+            for item in data:
+                self._collect_product_urls_from_json(item, product_urls)
+
+    @staticmethod
+    def _parse_category_html(html: str):
+        """Parse category HTML into (__NEXT_DATA__ text, script texts, hrefs)
+
+        Uses selectolax/Lexbor when available, BeautifulSoup otherwise.
+        """
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(html)
+            next_data_node = tree.css_first('script#__NEXT_DATA__')
+            next_data_text = next_data_node.text() if next_data_node else None
+            script_texts = [n.text() for n in tree.css('script') if n.text()]
+            hrefs = [n.attributes.get('href', '') for n in tree.css('a[href]')]
+            return next_data_text, script_texts, hrefs
+
+        soup = BeautifulSoup(html, 'lxml')
+        next_data_node = soup.find('script', id='__NEXT_DATA__')
+        next_data_text = next_data_node.string if next_data_node else None
+        script_texts = [s.string for s in soup.find_all('script') if s.string]
+        hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+        return next_data_text, script_texts, hrefs
+
+    async def _try_http_expand(self, category_url: str) -> Set[str]:
+        """Try to expand a category via plain HTTP, without rendering.
+
+        Samsung category pages usually ship their product grid as embedded
+        JSON (__NEXT_DATA__ or the pd19 product-finder payload), so a single
+        aiohttp GET is often enough and the browser stays parked.
+        """
+        product_urls = set()
+
+        try:
+            # Caller already holds the rate limiter slot; just report outcomes
+            async with self.session.get(category_url) as response:
+                if response.status in (429, 503):
+                    retry_after = response.headers.get('Retry-After')
+                    self.rate_limiter.note_throttled(
+                        float(retry_after) if retry_after and retry_after.isdigit() else None)
+                    return product_urls
+                if response.status != 200:
+                    return product_urls
+                html = await response.text()
+                self.rate_limiter.note_success()
+
+            next_data_text, script_texts, hrefs = self._parse_category_html(html)
+
+            # Embedded JSON feeds (Next.js data blob or inline product JSON)
+            if next_data_text:
+                try:
+                    self._collect_product_urls_from_json(
+                        json.loads(next_data_text), product_urls)
+                except json.JSONDecodeError:
+                    pass
+
+            # Inline scripts that carry pd19 product-finder payloads
+            if not product_urls:
+                for text in script_texts:
+                    if 'pdpUrl' not in text:
+                        continue
+                    for match in re.finditer(r'"pdpUrl"\s*:\s*"([^"]+)"', text):
+                        href = match.group(1).replace('\\/', '/')
+                        full_url = urljoin(BASE_URL, href) if href.startswith('/') else href
+                        if (self.is_samsung_uk_url(full_url) and
+                            self.is_individual_product_url(full_url)):
+                            product_urls.add(full_url)
+
+            # Static anchors are better than nothing on server-rendered pages
+            for href in hrefs:
+                if href.startswith('/'):
+                    full_url = urljoin(BASE_URL, href)
+                elif href.startswith('http'):
+                    full_url = href
+                else:
+                    continue
+                if (self.is_samsung_uk_url(full_url) and
+                    self.is_individual_product_url(full_url)):
+                    product_urls.add(full_url)
+
+        except Exception as e:
+            logger.debug(f"HTTP fast path failed for {category_url}: {e}")
+
+        return product_urls
+
     async def expand_category_url(self, category_url: str) -> Set[str]:
         """Expand a single category URL to extract all product URLs"""
         logger.info(f"Expanding category URL: {category_url}")
-        product_urls = set()
+
+        # HTTP fast path: no rendering needed when the grid ships as JSON/HTML
+        product_urls = await self._try_http_expand(category_url)
+        if len(product_urls) >= 10:
+            logger.info(f"HTTP fast path found {len(product_urls)} products in {category_url}")
+            # One timestamp covers the whole batch discovered together
+            now_iso = datetime.now(timezone.utc).isoformat()
+            for url in product_urls:
+                self._write_metadata(url, category_url, 'http_expansion', now_iso)
+            return product_urls
+
         page = None
-        
+
+        await self._ensure_browser()
+        ctx = self._next_context()
         try:
-            page = await self.browser.new_page()
-            
+            page = await ctx.new_page()
+
             # Set shorter timeout and try domcontentloaded first
             try:
                 await page.goto(category_url, wait_until='domcontentloaded', timeout=30000)
@@ -209,12 +527,19 @@ class ProductURLExpander:
                 # Fallback to no wait condition with even shorter timeout
                 await page.goto(category_url, timeout=15000)
             
-            # Wait for initial content
-            await page.wait_for_timeout(2000)
+            # Wait for initial content (event-driven; falls through quickly
+            # when the page is already settled)
+            try:
+                await page.wait_for_load_state('networkidle', timeout=5000)
+            except Exception:
+                pass
             
+            # Watch the DOM for grid growth instead of re-counting over CDP
+            await self._arm_product_mutation_watch(page)
+
             # Scroll to load all content
             await self._scroll_to_load_all_content(page)
-            
+
             # Handle "Load More" buttons and pagination
             await self._handle_pagination(page)
             
@@ -225,11 +550,12 @@ class ProductURLExpander:
             logger.error(f"Error expanding category URL {category_url}: {e}")
         finally:
             if page:
+                self._dom_watch.pop(page, None)
                 try:
                     await page.close()
                 except Exception:
                     pass
-        
+
         product_count = len(product_urls)
         logger.info(f"Found {product_count} products in {category_url}")
         
@@ -252,54 +578,90 @@ class ProductURLExpander:
             while scroll_attempts < max_scrolls:
                 # Scroll to bottom
                 await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                
-                # Wait for new content to load (reduced timeout)
-                await page.wait_for_timeout(1000)
-                
-                # Check if page height changed (new content loaded)
-                new_height = await page.evaluate('document.body.scrollHeight')
-                
-                if new_height == last_height:
+
+                # Wait for the page to actually grow rather than sleeping a
+                # fixed interval; content usually lands well under a second
+                try:
+                    await page.wait_for_function(
+                        'prev => document.body.scrollHeight !== prev',
+                        arg=last_height, timeout=2500
+                    )
+                except Exception:
+                    # Height never changed: no more lazy content
                     break
-                
-                last_height = new_height
+
+                last_height = await page.evaluate('document.body.scrollHeight')
                 scroll_attempts += 1
-            
+
             # Scroll back to top
             await page.evaluate('window.scrollTo(0, 0)')
-            await page.wait_for_timeout(500)
-            
+
         except Exception as e:
             logger.debug(f"Error during scrolling: {e}")
 
+    async def _arm_product_mutation_watch(self, page):
+        """Install a MutationObserver that pushes the /uk/ link count to Python.
+
+        Turns the count/recount polling cycle into an event: the page tells
+        us when the grid grew instead of us asking repeatedly over CDP.
+        """
+        state = {'count': 0, 'event': asyncio.Event()}
+
+        def _on_product_count(n):
+            if n > state['count']:
+                state['count'] = n
+                state['event'].set()
+
+        try:
+            await page.expose_function('onProductCount', _on_product_count)
+            await page.evaluate(
+                """() => {
+                    const report = () => window.onProductCount(
+                        document.querySelectorAll("a[href*='/uk/']").length);
+                    new MutationObserver(report).observe(
+                        document.body, {childList: true, subtree: true});
+                    report();
+                }"""
+            )
+            self._dom_watch[page] = state
+        except Exception as e:
+            logger.debug(f"Could not arm mutation watch: {e}")
+
+    async def _wait_for_new_products(self, page, links_before: int, timeout: int = 6000):
+        """Wait for the product grid to grow instead of sleeping a fixed interval"""
+        state = self._dom_watch.get(page)
+        if state is not None:
+            # Event-driven: woken by the in-page MutationObserver
+            deadline = time.monotonic() + timeout / 1000
+            while state['count'] <= links_before:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                state['event'].clear()
+                try:
+                    await asyncio.wait_for(state['event'].wait(), remaining)
+                except asyncio.TimeoutError:
+                    return
+            return
+
+        try:
+            await page.wait_for_function(
+                "prev => document.querySelectorAll(\"a[href*='/uk/']\").length > prev",
+                arg=links_before, timeout=timeout
+            )
+        except Exception:
+            # No growth within the timeout; the caller re-counts and decides
+            pass
+
     async def _count_products_for_pagination(self, page) -> int:
         """Count products on page for pagination verification"""
         try:
-            # Use the main product counting logic but optimized for speed
-            product_selectors = [
-                'a[href*="/uk/"][href*="-sm-"], a[href*="/uk/"][href*="-qe-"], a[href*="/uk/"][href*="-hw-"]',  # Samsung product URLs
-                'a[href*="/uk/smartphones/"], a[href*="/uk/computers/"], a[href*="/uk/tvs/"]',
-                'a[href*="/uk/audio"], a[href*="/uk/monitors/"], a[href*="/uk/tablets/"]'
-            ]
-            
-            max_count = 0
-            for selector in product_selectors:
-                try:
-                    elements = await page.query_selector_all(selector)
-                    # Quick filter for product URLs
-                    valid_count = 0
-                    for element in elements:
-                        href = await element.get_attribute('href')
-                        if href and self._is_likely_product_url(href):
-                            valid_count += 1
-                    
-                    if valid_count > max_count:
-                        max_count = valid_count
-                        
-                except Exception:
-                    continue
-                    
-            return max_count
+            # One evaluate returns every candidate href; counting via the
+            # per-element get_attribute round-trips was the old bottleneck
+            hrefs = await page.evaluate(
+                "() => [...document.querySelectorAll('a[href]')].map(a => a.getAttribute('href'))"
+            )
+            return sum(1 for href in hrefs if href and self._is_likely_product_url(href))
         except Exception:
             return 0
             
@@ -307,16 +669,7 @@ class ProductURLExpander:
         """Quick check if URL is likely a product URL"""
         if not url:
             return False
-            
-        # Product URL patterns (simplified for speed)
-        has_product_pattern = any(pattern in url for pattern in ['-sm-', '-qe-', '-hw-', '-np-', '-ls-', '-xe-'])
-        has_category = any(cat in url for cat in ['/smartphones/', '/computers/', '/tvs/', '/audio', '/monitors/', '/tablets/'])
-        
-        # Quick exclusion check
-        excludes = ['#', '/all-', '/buy', '/compare', '/support', '/?']
-        is_excluded = any(exc in url for exc in excludes)
-        
-        return has_product_pattern and has_category and not is_excluded
+        return _is_likely_product_url_cached(url)
 
     def _is_major_category(self, url: str) -> bool:
         """Check if this is a major Samsung category that should have many products"""
@@ -337,6 +690,9 @@ class ProductURLExpander:
             while load_more_attempts < max_attempts:
                 button_found = False
                 products_before = await self._count_products_for_pagination(page)
+                links_before = await page.evaluate(
+                    "document.querySelectorAll(\"a[href*='/uk/']\").length"
+                )
                 
                 # First try Samsung-specific product "View more" button (enhanced)
                 samsung_product_selectors = [
@@ -365,7 +721,7 @@ class ProductURLExpander:
                                 try:
                                     # Force click using JavaScript - works even if not visible
                                     await button.evaluate('button => button.click()')
-                                    await page.wait_for_timeout(5000)  # Longer wait for Samsung pages
+                                    await self._wait_for_new_products(page, links_before)
                                     await self._scroll_to_load_all_content(page)
                                     
                                     # Check if products were actually added
@@ -414,7 +770,7 @@ class ProductURLExpander:
                                 except Exception:
                                     await button.click()
                                     
-                                await page.wait_for_timeout(3000)
+                                await self._wait_for_new_products(page, links_before)
                                 await self._scroll_to_load_all_content(page)
                                 
                                 # Validate that products were actually added
@@ -452,7 +808,7 @@ class ProductURLExpander:
                                         logger.debug(f"Force-trying button: {selector}")
                                         try:
                                             await button.evaluate('button => button.click()')
-                                            await page.wait_for_timeout(5000)  # Longer wait
+                                            await self._wait_for_new_products(page, links_before)
                                             await self._scroll_to_load_all_content(page)
                                             
                                             products_after = await self._count_products_for_pagination(page)
@@ -500,7 +856,7 @@ class ProductURLExpander:
                                 except Exception:
                                     await button.click()
                                     
-                                await page.wait_for_timeout(3000)
+                                await self._wait_for_new_products(page, links_before)
                                 await self._scroll_to_load_all_content(page)
                                 
                                 # Validate products were added
@@ -524,64 +880,162 @@ class ProductURLExpander:
         except Exception as e:
             logger.debug(f"Error handling pagination: {e}")
 
+    def _filter_product_urls(self, full_urls: List[str]) -> List[str]:
+        """Filter absolute URLs down to individual Samsung UK product pages.
+
+        Big batches go through pyarrow's vectorized RE2 kernels (one C scan
+        over the whole column per pattern); small ones and installs without
+        pyarrow use the cached per-URL predicates.
+        """
+        if pa is not None and len(full_urls) > 200:
+            try:
+                arr = pa.array(full_urls, type=pa.string())
+                mask = (pc.starts_with(arr, BASE_URL) &
+                        pc.match_substring_regex(arr, _PRODUCT_INCLUDE_RE.pattern) &
+                        ~pc.match_substring_regex(arr, _PRODUCT_EXCLUDE_RE.pattern))
+                # starts_with(BASE_URL) admits e.g. /ukraine/; keep the
+                # stricter '/uk/' membership check from is_samsung_uk_url
+                return [u for u in arr.filter(mask).to_pylist() if '/uk/' in u]
+            except Exception as e:
+                logger.debug(f"Vectorized URL filter failed, falling back: {e}")
+
+        return [
+            u for u in full_urls
+            if self.is_samsung_uk_url(u) and self.is_individual_product_url(u)
+        ]
+
     async def _extract_product_links(self, page, source_url: str) -> Set[str]:
         """Extract all product links from the current page"""
         product_urls = set()
         
         try:
-            # Get all links on the page
-            links = await page.query_selector_all('a[href]')
-            
-            for link in links:
-                href = await link.get_attribute('href')
-                if not href:
-                    continue
-                
-                # Convert relative URLs to absolute
-                if href.startswith('/'):
-                    full_url = urljoin(BASE_URL, href)
-                elif href.startswith('http'):
-                    full_url = href
-                else:
-                    continue
-                
-                # Check if it's a Samsung UK URL and an individual product
-                if (self.is_samsung_uk_url(full_url) and 
-                    self.is_individual_product_url(full_url)):
-                    product_urls.add(full_url)
-                    
-                    # Store metadata
-                    self.expansion_metadata[full_url] = {
-                        'source_category_url': source_url,
-                        'discovered_at': datetime.now(timezone.utc).isoformat(),
-                        'extraction_method': 'dynamic_expansion'
-                    }
-            
+            # Pull every href in a single CDP round-trip and filter in Python
+            hrefs = await page.evaluate(
+                "() => [...document.querySelectorAll('a[href]')].map(a => a.getAttribute('href'))"
+            )
+
+            # Resolve relative URLs by concatenation: every href we keep
+            # is either /uk/... or already absolute, so full urljoin
+            # parsing is wasted work in this hot loop
+            full_urls = [
+                _ORIGIN + href if href[0] == '/' else href
+                for href in hrefs
+                if href and (href[0] == '/' or href.startswith('http'))
+            ]
+
+            # One timestamp covers every URL found on this page; per-URL
+            # datetime.now calls were measurable churn in this hot path
+            now_iso = datetime.now(timezone.utc).isoformat()
+            for full_url in self._filter_product_urls(full_urls):
+                product_urls.add(full_url)
+                self._write_metadata(full_url, source_url, 'dynamic_expansion', now_iso)
+
         except Exception as e:
             logger.error(f"Error extracting product links: {e}")
         
         return product_urls
 
+    async def _category_worker(self, queue: asyncio.Queue):
+        """Drain category URLs from the queue until cancelled"""
+        while True:
+            category_url = await queue.get()
+            try:
+                async with self.rate_limiter:
+                    product_urls = await self.expand_category_url(category_url)
+                self.expanded_urls.update(product_urls)
+                self.stats['pages_processed'] += 1
+                logger.info(f"Progress: {self.stats['pages_processed']}/{len(self.category_urls)} categories")
+            except Exception as e:
+                logger.error(f"Error processing category {category_url}: {e}")
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    def _iter_sitemap_locs(xml_bytes: bytes):
+        """Stream <loc> values out of a sitemap without building a full tree"""
+        try:
+            from lxml import etree
+            from io import BytesIO
+            for _, elem in etree.iterparse(BytesIO(xml_bytes), tag='{*}loc'):
+                if elem.text:
+                    yield elem.text.strip()
+                elem.clear()
+        except Exception:
+            # Malformed XML or no lxml: a regex sweep is good enough here
+            for match in re.finditer(rb'<loc>\s*([^<]+?)\s*</loc>', xml_bytes):
+                yield match.group(1).decode('utf-8', 'replace')
+
+    async def expand_from_sitemaps(self) -> Dict[str, int]:
+        """Harvest product URLs straight from sitemap.xml before rendering.
+
+        Sitemaps already enumerate product pages, so anything found here
+        never needs a browser. Returns per-category-segment product counts
+        used to decide which category pages still warrant rendering.
+        """
+        coverage: Dict[str, int] = {}
+        pending = [f"{BASE_URL}/sitemap.xml"]
+        seen_sitemaps = set()
+
+        while pending:
+            sitemap_url = pending.pop()
+            if sitemap_url in seen_sitemaps or len(seen_sitemaps) > 50:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            try:
+                async with self.rate_limiter:
+                    async with self.session.get(sitemap_url) as response:
+                        if response.status != 200:
+                            continue
+                        xml_bytes = await response.read()
+            except Exception as e:
+                logger.debug(f"Sitemap fetch failed for {sitemap_url}: {e}")
+                continue
+
+            for loc in self._iter_sitemap_locs(xml_bytes):
+                if loc.endswith('.xml'):
+                    pending.append(loc)
+                elif (self.is_samsung_uk_url(loc) and
+                      self.is_individual_product_url(loc)):
+                    self.expanded_urls.add(loc)
+                    self._write_metadata(loc, sitemap_url, 'sitemap')
+                    segment = loc[len(BASE_URL):].strip('/').split('/')[0]
+                    coverage[segment] = coverage.get(segment, 0) + 1
+
+        if self.expanded_urls:
+            logger.info(f"Sitemap pass yielded {len(self.expanded_urls)} product URLs")
+        return coverage
+
     async def expand_all_categories(self):
         """Expand all identified category URLs"""
         logger.info(f"Expanding {len(self.category_urls)} category URLs...")
-        
-        semaphore = asyncio.Semaphore(self.concurrency)
-        
-        async def process_category(category_url):
-            async with semaphore:
-                try:
-                    product_urls = await self.expand_category_url(category_url)
-                    self.expanded_urls.update(product_urls)
-                    self.stats['pages_processed'] += 1
-                    # Small delay to be respectful
-                    await asyncio.sleep(2)
-                except Exception as e:
-                    logger.error(f"Error processing category {category_url}: {e}")
-        
-        # Process categories concurrently
-        tasks = [process_category(url) for url in self.category_urls]
-        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Sitemaps first: whatever they cover never touches the browser
+        coverage = await self.expand_from_sitemaps()
+
+        def covered(category_url: str) -> bool:
+            segment = category_url[len(BASE_URL):].strip('/').split('/')[0]
+            return coverage.get(segment, 0) >= 10
+
+        render_urls = [u for u in self.category_urls if not covered(u)]
+        skipped = len(self.category_urls) - len(render_urls)
+        if skipped:
+            logger.info(f"Skipping {skipped} categories already covered by sitemaps")
+
+        # Feed a queue drained by a fixed number of workers: memory stays
+        # O(concurrency) instead of materializing a coroutine per category,
+        # and progress is reported as categories finish rather than at the end
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in render_urls:
+            queue.put_nowait(url)
+
+        workers = [
+            asyncio.create_task(self._category_worker(queue))
+            for _ in range(self.concurrency)
+        ]
+        await queue.join()
+        for worker in workers:
+            worker.cancel()
         
         self.stats['total_expanded_urls'] = len(self.expanded_urls)
         logger.info(f"Expansion complete: {len(self.expanded_urls)} product URLs found")
@@ -597,17 +1051,31 @@ class ProductURLExpander:
         all_urls = self.combine_all_urls()
         
         logger.info(f"Saving {len(all_urls)} expanded URLs to {output_file}")
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for url in sorted(all_urls):
-                f.write(url + '\n')
 
-    async def save_expansion_metadata(self, metadata_file: str = 'expansion_metadata.json'):
-        """Save expansion metadata to JSON file"""
-        logger.info(f"Saving expansion metadata to {metadata_file}")
-        
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.expansion_metadata, f, indent=2, ensure_ascii=False)
+        # Sort in place and write once: a single join + write beats one
+        # f.write call per URL, and the large buffer batches the flushes
+        urls = list(all_urls)
+        urls.sort()
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write('\n'.join(urls))
+            f.write('\n')
+
+    def _write_metadata(self, url: str, source_url: str, method: str,
+                        discovered_at: Optional[str] = None):
+        """Append one metadata record to the JSONL stream"""
+        if self._meta_fp is None or url in self._meta_seen:
+            return
+        self._meta_seen.add(url)
+        record = {
+            'url': url,
+            'source_category_url': source_url,
+            'discovered_at': discovered_at or datetime.now(timezone.utc).isoformat(),
+            'extraction_method': method
+        }
+        if orjson is not None:
+            self._meta_fp.write(orjson.dumps(record).decode() + '\n')
+        else:
+            self._meta_fp.write(json.dumps(record, ensure_ascii=False) + '\n')
 
     def print_summary(self):
         """Print expansion summary"""
@@ -643,9 +1111,8 @@ class ProductURLExpander:
         else:
             logger.info("No category URLs found to expand")
         
-        # Save results
+        # Save results (metadata has been streamed to JSONL along the way)
         await self.save_expanded_urls(output_file)
-        await self.save_expansion_metadata()
         
         self.stats['end_time'] = datetime.now(timezone.utc)
         self.print_summary()
@@ -668,4 +1135,11 @@ async def main():
         await expander.run(args.input, args.output)
 
 if __name__ == "__main__":
+    # uvloop's libuv-backed event loop is markedly faster for I/O-heavy
+    # crawls; purely optional
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
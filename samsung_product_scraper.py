@@ -6,7 +6,7 @@ This script extracts product data from a list of pre-discovered Samsung UK produ
 It focuses purely on data extraction with improved selectors and error handling.
 
 Usage:
-    python3 -m pip install playwright aiohttp pydantic tenacity pandas pyarrow bs4 lxml
+    python3 -m pip install playwright aiohttp tenacity pyarrow bs4 lxml
     playwright install
     python samsung_product_scraper.py --input product_urls.txt
 """
@@ -15,16 +15,27 @@ import asyncio
 import json
 import logging
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from typing import List, Optional, Set
 import argparse
 import os
 
 import aiohttp
-import pandas as pd
-from bs4 import BeautifulSoup
+import pyarrow as pa
+import pyarrow.parquet as pq
 from playwright.async_api import async_playwright
-from pydantic import BaseModel, Field, field_validator
+
+from _parse_worker import parse_html, fields_from_raw_jsonld
+
+# orjson serialises to bytes several times faster than the stdlib encoder;
+# fall back to json when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 # Configure logging
@@ -42,50 +53,117 @@ logger = logging.getLogger(__name__)
 BASE_URL = "https://www.samsung.com/uk"
 USER_AGENT = "Samsung-UK-Product-Scraper/1.0 (contact: scraper@example.com)"
 
-class ProductSchema(BaseModel):
-    """Pydantic model for product data validation"""
-    url: str = Field(..., description="Product URL")
-    sku: Optional[str] = Field(None, description="Product SKU")
-    name: str = Field(..., description="Product name")
-    category: Optional[str] = Field(None, description="Main category")
-    sub_category: Optional[str] = Field(None, description="Sub category")
-    price_gbp: Optional[float] = Field(None, description="Price in GBP")
-    currency: Optional[str] = Field(None, description="Currency code")
-    availability: Optional[str] = Field(None, description="Availability status")
-    image_url: Optional[str] = Field(None, description="Product image URL")
-    description: Optional[str] = Field(None, description="Product description")
-    model_code: Optional[str] = Field(None, description="Model code")
-    brand: str = Field(default="Samsung", description="Brand name")
-    timestamp_utc: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-    @field_validator('price_gbp', mode='before')
-    @classmethod
-    def parse_price(cls, v):
-        if v is None:
-            return None
-        if isinstance(v, str):
-            # Remove currency symbols and convert to float
-            price_str = re.sub(r'[£$€,\s]', '', v)
-            try:
-                return float(price_str)
-            except ValueError:
-                return None
-        return float(v) if v else None
-
-    @field_validator('url')
-    @classmethod
-    def validate_url(cls, v):
-        if not v.startswith('http'):
-            raise ValueError('URL must be absolute')
-        return v
+# Resource types that never contribute to product extraction; aborting them
+# saves most of the bandwidth and render time of a dynamic fetch
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+CONTEXT_POOL_SIZE = 4
+
+# Returned by _fetch_static when the server-rendered HTML carries no product
+# JSON-LD, i.e. the page genuinely needs a browser to render
+NEEDS_DYNAMIC = object()
+_PRODUCT_JSONLD_MARKERS = (b'"@type":"Product"', b'"@type": "Product"')
+
+# Single compiled scan replacing the per-response any()-of-substrings probe
+# in the dynamic response hook
+_API_URL_KW_RE = re.compile(r'product|api|data')
+ETAG_CACHE_FILE = 'etag_cache.json'
+REQUESTS_PER_SECOND = 4.0
+PARQUET_CHUNK_ROWS = 10_000
+
+@dataclass(slots=True)
+class ProductRecord:
+    """Plain record for extracted product data.
+
+    Fields are coerced at the extraction sites (in _parse_worker) and records
+    are validated in bulk at save time, so per-instance construction is just
+    attribute assignment — no validator machinery on the hot path.
+    """
+    url: str
+    name: str
+    sku: Optional[str] = None
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    price_gbp: Optional[float] = None
+    currency: Optional[str] = None
+    availability: Optional[str] = None
+    image_url: Optional[str] = None
+    description: Optional[str] = None
+    model_code: Optional[str] = None
+    brand: str = "Samsung"
+    timestamp_utc: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """JSON-safe dict representation"""
+        data = asdict(self)
+        ts = data['timestamp_utc']
+        if isinstance(ts, datetime):
+            data['timestamp_utc'] = ts.isoformat()
+        return data
+
+    def is_valid(self) -> bool:
+        """Minimal sanity check applied before records hit disk"""
+        return bool(self.name) and self.url.startswith('http')
+
+
+# Fixed Arrow schema (field order mirrors ProductRecord) so every Parquet
+# chunk agrees even when a column is entirely null in one of them
+_PRODUCT_ARROW_SCHEMA = pa.schema([
+    ('url', pa.string()),
+    ('name', pa.string()),
+    ('sku', pa.string()),
+    ('category', pa.string()),
+    ('sub_category', pa.string()),
+    ('price_gbp', pa.float64()),
+    ('currency', pa.string()),
+    ('availability', pa.string()),
+    ('image_url', pa.string()),
+    ('description', pa.string()),
+    ('model_code', pa.string()),
+    ('brand', pa.string()),
+    ('timestamp_utc', pa.string()),
+])
+
+class TokenBucketLimiter:
+    """Token-bucket pacing shared across all workers.
+
+    Tokens refill continuously at `rate` per second up to `burst`, so the
+    crawl sustains a steady aggregate request rate while short bursts are
+    absorbed without sleeping. acquire() only waits when the bucket is
+    actually empty.
+    """
+
+    def __init__(self, rate: float, burst: int = 4):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            wait = (1 - self._tokens) / self.rate
+            self._tokens = 0.0
+        await asyncio.sleep(wait)
+
 
 class SamsungProductScraper:
-    def __init__(self, concurrency: int = 8):
+    def __init__(self, concurrency: int = 8, incremental: bool = False):
         self.concurrency = concurrency
-        self.semaphore = asyncio.Semaphore(concurrency)
+        self.incremental = incremental
+        self.rate_limiter = TokenBucketLimiter(rate=REQUESTS_PER_SECOND)
+        # HTML parsing is CPU-bound; worker processes keep it off the event
+        # loop (and off the GIL entirely)
+        self.parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
         self.session: Optional[aiohttp.ClientSession] = None
         self.playwright = None
         self.browser = None
+        self.context_pool: Optional[asyncio.Queue] = None
         
         # Statistics
         self.stats = {
@@ -98,13 +176,46 @@ class SamsungProductScraper:
             'end_time': None
         }
         
-        # Results
-        self.products: List[ProductSchema] = []
+        # Streaming outputs: records go straight to disk as they complete,
+        # so memory stays O(concurrency) instead of O(crawl size)
+        self.products_written = 0
+        self.category_counts: dict = {}
+        self.ndjson_f = None
+        self.pq_writer = None
+        self._pq_chunk: List[dict] = []
         self.failed_urls: List[str] = []
+        
+        # Validator cache for conditional requests across runs
+        self.etag_cache = self._load_etag_cache()
+
+    @staticmethod
+    def _load_etag_cache() -> dict:
+        """Load the ETag/Last-Modified sidecar from a previous run"""
+        try:
+            with open(ETAG_CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_etag_cache(self):
+        """Persist response validators and extracted products for reuse"""
+        try:
+            with open(ETAG_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self.etag_cache, f)
+            logger.info(f"Saved {len(self.etag_cache)} cache entries to {ETAG_CACHE_FILE}")
+        except Exception as e:
+            logger.error(f"Error saving ETag cache: {e}")
 
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=20)
+        # Nearly every request hits www.samsung.com, so the per-host cap is
+        # the real ceiling; keep it at or above the worker count so workers
+        # never queue behind the connector
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=max(self.concurrency, 20),
+            ttl_dns_cache=300,
+        )
         timeout = aiohttp.ClientTimeout(total=60, connect=15)
         
         self.session = aiohttp.ClientSession(
@@ -113,96 +224,231 @@ class SamsungProductScraper:
             headers={'User-Agent': USER_AGENT}
         )
         
+        self.ndjson_f = open('products.ndjson', 'wb', buffering=1 << 20)
+        
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=True,
             args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-web-security']
         )
         
+        # Reusable contexts: creating one per URL costs ~100ms each, so hand
+        # them out from a small pool instead
+        self.context_pool = asyncio.Queue()
+        for _ in range(min(CONTEXT_POOL_SIZE, self.concurrency)):
+            context = await self.browser.new_context(user_agent=USER_AGENT)
+            await context.route('**/*', self._route_filter)
+            self.context_pool.put_nowait(context)
+        
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         if self.session:
             await self.session.close()
+        if self.context_pool:
+            while not self.context_pool.empty():
+                await self.context_pool.get_nowait().close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        self.parse_pool.shutdown(wait=False, cancel_futures=True)
+        self._close_outputs()
+
+    def _write_product(self, product: ProductRecord):
+        """Append one record to the NDJSON stream and the Parquet chunk buffer"""
+        data = product.to_dict()
+        if orjson is not None:
+            self.ndjson_f.write(orjson.dumps(data) + b'\n')
+        else:
+            self.ndjson_f.write(json.dumps(data).encode('utf-8') + b'\n')
+        
+        self._pq_chunk.append(data)
+        if len(self._pq_chunk) >= PARQUET_CHUNK_ROWS:
+            self._flush_parquet_chunk()
+        
+        self.products_written += 1
+        cat = product.category or 'Unknown'
+        self.category_counts[cat] = self.category_counts.get(cat, 0) + 1
 
-    def load_urls(self, filename: str) -> List[str]:
-        """Load URLs from file"""
-        urls = []
+    def _flush_parquet_chunk(self):
+        """Write the buffered rows as one Parquet row group"""
+        if not self._pq_chunk:
+            return
+        table = pa.Table.from_pylist(self._pq_chunk, schema=_PRODUCT_ARROW_SCHEMA)
+        if self.pq_writer is None:
+            self.pq_writer = pq.ParquetWriter('products.parquet', _PRODUCT_ARROW_SCHEMA, compression='zstd')
+        self.pq_writer.write_table(table)
+        self._pq_chunk.clear()
+
+    def _close_outputs(self):
+        """Flush and close the streaming NDJSON/Parquet outputs"""
+        try:
+            self._flush_parquet_chunk()
+        except Exception as e:
+            logger.error(f"Error flushing Parquet chunk: {e}")
+        if self.pq_writer is not None:
+            self.pq_writer.close()
+            self.pq_writer = None
+        if self.ndjson_f is not None:
+            self.ndjson_f.close()
+            self.ndjson_f = None
+            logger.info(f"Wrote {self.products_written} products to products.ndjson/products.parquet")
+
+    @staticmethod
+    async def _route_filter(route):
+        """Abort requests for resources that extraction never needs"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def iter_urls(self, filename: str):
+        """Yield URLs from file one line at a time"""
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 for line in f:
                     url = line.strip()
                     if url and url.startswith('http'):
-                        urls.append(url)
-            logger.info(f"Loaded {len(urls)} URLs from {filename}")
+                        yield url
         except FileNotFoundError:
             logger.error(f"File not found: {filename}")
         except Exception as e:
             logger.error(f"Error loading URLs from {filename}: {e}")
-        
-        return urls
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=8),
         retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError))
     )
-    async def fetch_product_data(self, url: str) -> Optional[ProductSchema]:
+    async def fetch_product_data(self, url: str) -> Optional[ProductRecord]:
         """Fetch and extract product data from a URL"""
-        async with self.semaphore:
-            try:
-                # Try static fetch first
-                product_data = await self._fetch_static(url)
-                if product_data:
-                    return product_data
-                
-                # Fall back to dynamic fetch
-                product_data = await self._fetch_dynamic(url)
-                return product_data
-                
-            except Exception as e:
-                logger.debug(f"Failed to fetch {url}: {e}")
-                self.stats['retries'] += 1
-                raise
+        try:
+            # Incremental runs probe with a HEAD first: an unchanged page
+            # costs <1KB instead of the full HTML body
+            if self.incremental:
+                cached_product = await self._probe_if_changed(url)
+                if cached_product:
+                    return cached_product
+            
+            # Try static fetch first
+            product_data = await self._fetch_static(url)
+            if product_data is NEEDS_DYNAMIC:
+                # Only pages without server-rendered product data get the
+                # (much more expensive) browser treatment
+                return await self._fetch_dynamic(url)
+            return product_data
+            
+        except Exception as e:
+            logger.debug(f"Failed to fetch {url}: {e}")
+            self.stats['retries'] += 1
+            raise
 
-    async def _fetch_static(self, url: str) -> Optional[ProductSchema]:
+    async def _probe_if_changed(self, url: str) -> Optional[ProductRecord]:
+        """HEAD probe with cached validators; returns the cached record on 304"""
+        cached = self.etag_cache.get(url)
+        if not cached or not cached.get('product'):
+            return None
+        
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        if not headers:
+            return None
+        
+        try:
+            await self.rate_limiter.acquire()
+            async with self.session.head(url, headers=headers, allow_redirects=True) as response:
+                if response.status == 304:
+                    logger.debug(f"HEAD probe: unchanged, using cache for {url}")
+                    return ProductRecord(**cached['product'])
+                # Anything else (200 with new ETag, or a server that
+                # dislikes HEAD) falls through to the normal fetch
+        except Exception as e:
+            logger.debug(f"HEAD probe failed for {url}: {e}")
+        return None
+
+    async def _fetch_static(self, url: str) -> Optional[ProductRecord]:
         """Fetch product data using static HTTP request"""
         try:
-            async with self.session.get(url) as response:
+            # Conditional request: send validators from the previous run so
+            # unchanged pages come back as a body-less 304
+            headers = {}
+            cached = self.etag_cache.get(url)
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            await self.rate_limiter.acquire()
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and cached and cached.get('product'):
+                    logger.debug(f"304 Not Modified, using cached product for {url}")
+                    return ProductRecord(**cached['product'])
+                
                 if response.status != 200:
                     logger.debug(f"HTTP {response.status} for {url}")
                     return None
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
                 
-                # Try JSON-LD first (most reliable)
-                product_data = self._extract_from_json_ld(soup, url)
-                if product_data:
-                    return product_data
+                raw = await response.read()
                 
-                # Fall back to CSS selectors
-                return self._extract_from_css_selectors(soup, url)
+                # Cheap substring probe before committing to a full parse:
+                # no product JSON-LD in the raw HTML means the page is
+                # client-rendered and needs the browser path
+                if not any(marker in raw for marker in _PRODUCT_JSONLD_MARKERS):
+                    return NEEDS_DYNAMIC
+                
+                # Fast path: a byte regex locates the JSON-LD scripts without
+                # any DOM construction; most Samsung PDPs resolve here
+                fields = fields_from_raw_jsonld(raw, url)
+                
+                if fields is None:
+                    # Full extraction happens in a worker process so the
+                    # event loop keeps servicing other fetches during the parse
+                    html = raw.decode('utf-8', errors='replace')
+                    loop = asyncio.get_running_loop()
+                    fields = await loop.run_in_executor(self.parse_pool, parse_html, html, url)
+                
+                product_data = ProductRecord(**fields) if fields else None
+                
+                if product_data and (etag or last_modified):
+                    self.etag_cache[url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'product': product_data.to_dict()
+                    }
+                
+                return product_data
                 
         except Exception as e:
             logger.debug(f"Static fetch failed for {url}: {e}")
             return None
 
-    async def _fetch_dynamic(self, url: str) -> Optional[ProductSchema]:
+    async def _fetch_dynamic(self, url: str) -> Optional[ProductRecord]:
         """Fetch product data using Playwright for dynamic content"""
+        context = await self.context_pool.get()
+        page = None
         try:
-            page = await self.browser.new_page()
+            page = await context.new_page()
             
             # Intercept network responses for additional data
             api_data = {}
             async def handle_response(response):
-                if ('json' in response.headers.get('content-type', '') and 
-                    any(keyword in response.url for keyword in ['product', 'api', 'data'])):
+                # Hundreds of responses fire per page; only XHR/fetch calls
+                # can carry product API data, so bail on everything else
+                # before touching headers
+                if response.request.resource_type not in ('xhr', 'fetch'):
+                    return
+                if _API_URL_KW_RE.search(response.url) is None:
+                    return
+                if 'json' in response.headers.get('content-type', ''):
                     try:
                         data = await response.json()
                         api_data.update(data)
@@ -211,276 +457,49 @@ class SamsungProductScraper:
             
             page.on('response', handle_response)
             
-            # Navigate and wait for content
-            await page.goto(url, wait_until='networkidle', timeout=45000)
-            
-            # Wait for potential dynamic content loading
-            await page.wait_for_timeout(2000)
+            # Navigate and wait only for the markers extraction actually
+            # reads, not for the network to go quiet
+            await page.goto(url, wait_until='domcontentloaded', timeout=45000)
+            try:
+                await page.wait_for_selector(
+                    'h1[data-testid="pdp-product-name"], script[type="application/ld+json"]',
+                    timeout=8000
+                )
+            except Exception:
+                # Marker never appeared; extract whatever rendered
+                pass
             
             # Get final HTML
             html = await page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+            await page.close()
             
-            # Try JSON-LD from dynamic content
-            product_data = self._extract_from_json_ld(soup, url)
-            if product_data:
-                await page.close()
-                return product_data
+            # Same off-loop extraction pipeline as the static path
+            loop = asyncio.get_running_loop()
+            fields = await loop.run_in_executor(self.parse_pool, parse_html, html, url)
+            if fields:
+                return ProductRecord(**fields)
             
             # Try API data if available
             if api_data:
-                product_data = self._extract_from_api_data(api_data, url)
-                if product_data:
-                    await page.close()
-                    return product_data
-            
-            # Fall back to CSS selectors on dynamic content
-            product_data = self._extract_from_css_selectors(soup, url)
-            await page.close()
-            return product_data
+                return self._extract_from_api_data(api_data, url)
             
-        except Exception as e:
-            logger.debug(f"Dynamic fetch failed for {url}: {e}")
             return None
-
-    def _extract_from_json_ld(self, soup: BeautifulSoup, url: str) -> Optional[ProductSchema]:
-        """Extract product data from JSON-LD structured data"""
-        try:
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            
-            for script in json_ld_scripts:
-                if not script.string:
-                    continue
-                    
-                try:
-                    data = json.loads(script.string)
-                    
-                    # Handle different JSON-LD structures
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return self._create_product_from_json_ld(item, url)
-                    elif data.get('@type') == 'Product':
-                        return self._create_product_from_json_ld(data, url)
-                    elif 'product' in data:
-                        product_data = data['product']
-                        if isinstance(product_data, dict):
-                            return self._create_product_from_json_ld(product_data, url)
-                        
-                except (json.JSONDecodeError, KeyError) as e:
-                    logger.debug(f"JSON-LD parsing error for {url}: {e}")
-                    continue
-            
-        except Exception as e:
-            logger.debug(f"JSON-LD extraction failed for {url}: {e}")
-        
-        return None
-
-    def _create_product_from_json_ld(self, data: dict, url: str) -> Optional[ProductSchema]:
-        """Create ProductSchema from JSON-LD data"""
-        try:
-            # Extract offers data
-            offers = data.get('offers', {})
-            if isinstance(offers, list):
-                offers = offers[0] if offers else {}
-            
-            # Extract image
-            image = data.get('image')
-            if isinstance(image, list):
-                image = image[0] if image else None
-            if isinstance(image, dict):
-                image = image.get('url', image.get('@id'))
-            
-            # Make image URL absolute
-            if image and image.startswith('/'):
-                image = BASE_URL + image
-            
-            # Extract category information
-            category = data.get('category')
-            sub_category = None
-            if isinstance(category, list):
-                category = category[0] if category else None
-                sub_category = category[1] if len(category) > 1 else None
-            
-            # Extract description
-            description = data.get('description', data.get('text', ''))
-            if isinstance(description, list):
-                description = ' '.join(description)
-            
-            product = ProductSchema(
-                url=url,
-                sku=data.get('sku', data.get('mpn', data.get('productID'))),
-                name=data.get('name', ''),
-                category=category,
-                sub_category=sub_category,
-                price_gbp=offers.get('price'),
-                currency=offers.get('priceCurrency', 'GBP'),
-                availability=offers.get('availability', '').replace('https://schema.org/', ''),
-                image_url=image,
-                description=description[:500] if description else None,  # Limit description length
-                model_code=data.get('model', data.get('modelCode', data.get('mpn')))
-            )
-            
-            return product
             
         except Exception as e:
-            logger.debug(f"Error creating product from JSON-LD: {e}")
+            logger.debug(f"Dynamic fetch failed for {url}: {e}")
             return None
-
-    def _extract_from_css_selectors(self, soup: BeautifulSoup, url: str) -> Optional[ProductSchema]:
-        """Extract product data using CSS selectors as fallback"""
-        try:
-            # Samsung UK specific CSS selectors
-            name_selectors = [
-                'h1[data-testid="pdp-product-name"]',
-                'h1.pdp-product-name',
-                'h1.product-title',
-                '.product-name h1',
-                '.pdp-product-name',
-                'h1[class*="product"]',
-                'h1[id*="product"]'
-            ]
-            
-            price_selectors = [
-                '[data-testid="price-current"]',
-                '.price-current',
-                '.current-price',
-                '.price .current',
-                '.product-price .current',
-                '.price-value',
-                '[class*="price"][class*="current"]'
-            ]
-            
-            image_selectors = [
-                '.pdp-gallery img[src]',
-                '.product-image img[src]',
-                '.hero-image img[src]',
-                '.product-gallery img[src]',
-                '.main-image img[src]',
-                '[data-testid="pdp-gallery"] img[src]'
-            ]
-            
-            sku_selectors = [
-                '[data-testid="model-code"]',
-                '.model-code',
-                '.product-sku',
-                '.sku-value',
-                '[class*="model-code"]',
-                '[id*="model-code"]'
-            ]
-            
-            description_selectors = [
-                '.product-description',
-                '.pdp-description',
-                '.product-overview',
-                '[data-testid="product-description"]',
-                '.product-details p'
-            ]
-            
-            availability_selectors = [
-                '.availability-status',
-                '.stock-status',
-                '[data-testid="availability"]',
-                '.product-availability'
-            ]
-            
-            # Extract data using selectors
-            name = self._extract_text_by_selectors(soup, name_selectors)
-            price_text = self._extract_text_by_selectors(soup, price_selectors)
-            image_url = self._extract_attr_by_selectors(soup, image_selectors, 'src')
-            sku = self._extract_text_by_selectors(soup, sku_selectors)
-            description = self._extract_text_by_selectors(soup, description_selectors)
-            availability = self._extract_text_by_selectors(soup, availability_selectors)
-            
-            # If no name found, try title tag
-            if not name:
-                title_tag = soup.find('title')
-                if title_tag:
-                    name = title_tag.get_text(strip=True).split('|')[0].strip()
-            
-            if not name:
-                logger.debug(f"No product name found for {url}")
-                return None
-            
-            # Parse price
-            price_gbp = None
-            if price_text:
-                # Remove non-numeric characters except decimal point
-                price_cleaned = re.sub(r'[^\d.]', '', price_text)
+        finally:
+            # Contexts are pooled for the whole run: a page left open by a
+            # failed goto would leak (listener included) into every later
+            # fetch, so close it before handing the context back
+            if page is not None and not page.is_closed():
                 try:
-                    price_gbp = float(price_cleaned) if price_cleaned else None
-                except ValueError:
+                    await page.close()
+                except Exception:
                     pass
-            
-            # Make image URL absolute
-            if image_url and image_url.startswith('/'):
-                image_url = BASE_URL + image_url
-            
-            # Extract category from URL
-            category = self._extract_category_from_url(url)
-            
-            product = ProductSchema(
-                url=url,
-                sku=sku,
-                name=name,
-                category=category,
-                price_gbp=price_gbp,
-                currency='GBP',
-                availability=availability,
-                image_url=image_url,
-                description=description[:500] if description else None,
-                model_code=sku
-            )
-            
-            return product
-            
-        except Exception as e:
-            logger.debug(f"CSS selector extraction failed for {url}: {e}")
-            return None
-
-    def _extract_text_by_selectors(self, soup: BeautifulSoup, selectors: List[str]) -> Optional[str]:
-        """Extract text using list of CSS selectors"""
-        for selector in selectors:
-            try:
-                element = soup.select_one(selector)
-                if element:
-                    text = element.get_text(strip=True)
-                    if text:
-                        return text
-            except Exception:
-                continue
-        return None
-
-    def _extract_attr_by_selectors(self, soup: BeautifulSoup, selectors: List[str], attr: str) -> Optional[str]:
-        """Extract attribute using list of CSS selectors"""
-        for selector in selectors:
-            try:
-                element = soup.select_one(selector)
-                if element and element.get(attr):
-                    return element[attr]
-            except Exception:
-                continue
-        return None
+            self.context_pool.put_nowait(context)
 
-    def _extract_category_from_url(self, url: str) -> Optional[str]:
-        """Extract category from URL path"""
-        try:
-            from urllib.parse import urlparse
-            path = urlparse(url).path.strip('/')
-            parts = path.split('/')
-            
-            # Skip language/region parts
-            if len(parts) > 0 and parts[0] == 'uk':
-                parts = parts[1:]
-            
-            # Return first meaningful category
-            if parts and parts[0] not in ['buy', 'product']:
-                return parts[0].replace('-', ' ').title()
-        except Exception:
-            pass
-        return None
-
-    def _extract_from_api_data(self, api_data: dict, url: str) -> Optional[ProductSchema]:
+    def _extract_from_api_data(self, api_data: dict, url: str) -> Optional[ProductRecord]:
         """Extract product data from intercepted API responses"""
         try:
             # This would need to be customized based on Samsung's actual API structure
@@ -490,32 +509,6 @@ class SamsungProductScraper:
             logger.debug(f"API data extraction failed for {url}: {e}")
             return None
 
-    async def save_products_ndjson(self, filename: str = 'products.ndjson'):
-        """Save products to NDJSON file"""
-        logger.info(f"Saving {len(self.products)} products to {filename}")
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            for product in self.products:
-                json_line = product.model_dump_json()
-                f.write(json_line + '\n')
-
-    async def save_products_parquet(self, filename: str = 'products.parquet'):
-        """Convert products to Parquet format"""
-        if not self.products:
-            logger.warning("No products to save to Parquet")
-            return
-            
-        logger.info(f"Converting {len(self.products)} products to Parquet format: {filename}")
-        
-        try:
-            # Convert products to dict format
-            products_dict = [product.model_dump() for product in self.products]
-            df = pd.DataFrame(products_dict)
-            df.to_parquet(filename, engine='pyarrow', index=False)
-            logger.info(f"Parquet file saved: {filename}")
-        except Exception as e:
-            logger.error(f"Error saving Parquet file: {e}")
-
     async def save_failed_urls(self, filename: str = 'failed_urls.txt'):
         """Save failed URLs to file"""
         if self.failed_urls:
@@ -541,14 +534,9 @@ class SamsungProductScraper:
         print(f"Average time per URL: {duration/max(self.stats['processed_urls'], 1):.2f} seconds")
         
         # Category breakdown
-        if self.products:
-            categories = {}
-            for product in self.products:
-                cat = product.category or 'Unknown'
-                categories[cat] = categories.get(cat, 0) + 1
-            
+        if self.category_counts:
             print("\nProducts by category:")
-            for category, count in sorted(categories.items()):
+            for category, count in sorted(self.category_counts.items()):
                 print(f"  {category}: {count}")
         
         print("="*60)
@@ -558,54 +546,64 @@ class SamsungProductScraper:
         self.stats['start_time'] = datetime.now(timezone.utc)
         logger.info("Starting Samsung UK product extraction...")
         
-        # Load URLs
-        urls = self.load_urls(input_file)
-        if not urls:
-            logger.error("No URLs to process")
-            return
-        
-        self.stats['total_urls'] = len(urls)
-        logger.info(f"Processing {len(urls)} product URLs...")
         
-        # Process URLs with concurrency control
-        semaphore = asyncio.Semaphore(self.concurrency)
+        # A fixed worker pool draining a bounded queue is the only
+        # concurrency control: the old version gated each fetch behind two
+        # stacked semaphores and created a task per URL up front
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
         
         async def process_url(url):
-            async with semaphore:
-                try:
-                    product = await self.fetch_product_data(url)
-                    if product:
-                        self.products.append(product)
-                        self.stats['successful_extractions'] += 1
-                        logger.debug(f"✓ Extracted: {product.name[:50]}...")
-                    else:
-                        self.failed_urls.append(url)
-                        self.stats['failed_extractions'] += 1
-                        logger.debug(f"✗ Failed: {url}")
-                    
-                    self.stats['processed_urls'] += 1
-                    
-                    # Progress logging
-                    if self.stats['processed_urls'] % 50 == 0:
-                        logger.info(f"Progress: {self.stats['processed_urls']}/{len(urls)} "
-                                  f"({self.stats['successful_extractions']} successful)")
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
+            try:
+                product = await self.fetch_product_data(url)
+                if product and product.is_valid():
+                    self._write_product(product)
+                    self.stats['successful_extractions'] += 1
+                    logger.debug(f"✓ Extracted: {product.name[:50]}...")
+                else:
                     self.failed_urls.append(url)
                     self.stats['failed_extractions'] += 1
-                    logger.error(f"Error processing {url}: {e}")
+                    logger.debug(f"✗ Failed: {url}")
+                
+                self.stats['processed_urls'] += 1
+                
+                # Progress logging
+                if self.stats['processed_urls'] % 50 == 0:
+                    logger.info(f"Progress: {self.stats['processed_urls']}/{self.stats['total_urls']} queued "
+                              f"({self.stats['successful_extractions']} successful)")
+                
+            except Exception as e:
+                self.failed_urls.append(url)
+                self.stats['failed_extractions'] += 1
+                logger.error(f"Error processing {url}: {e}")
         
-        # Execute all tasks
-        tasks = [process_url(url) for url in urls]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker():
+            while True:
+                url = await queue.get()
+                try:
+                    if url is None:
+                        return
+                    await process_url(url)
+                finally:
+                    queue.task_done()
+        
+        # Stream URLs straight from disk into the queue; the input file is
+        # never materialised as a list, and total_urls counts as we go
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(self.concurrency):
+                tg.create_task(worker())
+            for url in self.iter_urls(input_file):
+                self.stats['total_urls'] += 1
+                await queue.put(url)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+        
+        if not self.stats['total_urls']:
+            logger.error("No URLs to process")
         
-        # Save results
-        await self.save_products_ndjson()
-        await self.save_products_parquet()
+        # Save results (product data has been streaming to disk all along)
+        self._close_outputs()
         await self.save_failed_urls()
+        self.save_etag_cache()
         
         self.stats['end_time'] = datetime.now(timezone.utc)
         self.print_summary()
@@ -619,13 +617,22 @@ async def main():
                        help='Input file containing product URLs')
     parser.add_argument('--concurrency', type=int, default=8, 
                        help='Number of concurrent requests')
+    parser.add_argument('--incremental', action='store_true',
+                       help='HEAD-probe cached URLs and skip unchanged pages')
     args = parser.parse_args()
     
     # Override concurrency from environment variable if set
     concurrency = int(os.getenv('SCRAPER_CONCURRENCY', args.concurrency))
     
-    async with SamsungProductScraper(concurrency=concurrency) as scraper:
+    async with SamsungProductScraper(concurrency=concurrency, incremental=args.incremental) as scraper:
         await scraper.run(args.input)
 
 if __name__ == "__main__":
+    # uvloop's libuv-backed event loop is markedly faster for I/O-heavy
+    # crawls; purely optional
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -5,31 +5,52 @@ Samsung UK Product Scraper
 A comprehensive scraper for Samsung UK's product catalog that:
 - Discovers products via sitemap parsing + hardcoded fallback URLs
 - Extracts data using JSON-LD (primary) + CSS selectors (fallback)
-- Validates output with Pydantic models
+- Validates output with msgspec models
 - Handles failures with retry logic and failed URL logging
 - Manages concurrency with rate limiting
 - Outputs data as NDJSON + Parquet with comprehensive logging
 
 Usage:
-    python3 -m pip install playwright aiohttp pydantic tenacity pandas pyarrow bs4 lxml
+    python3 -m pip install playwright aiohttp msgspec tenacity pyarrow bs4 lxml
     playwright install
     python samsung_uk_scraper.py
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import re
+import sqlite3
+import time
 from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from typing import List, Optional, Set
 import argparse
 import os
 
 import aiohttp
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import json as pa_json
+import msgspec
 from bs4 import BeautifulSoup
+from glom import glom, Coalesce
+
+# orjson decodes the large schema.org blobs Samsung embeds 2-5x faster than
+# the stdlib parser; fall back to json when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from playwright.async_api import async_playwright
-from pydantic import BaseModel, Field, field_validator
+
+# Lexbor parses HTML in C and is 10-30x faster than bs4's pure-Python
+# html.parser on the page sizes this scraper sees; fall back when missing
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 # Configure logging
@@ -46,8 +67,26 @@ logger = logging.getLogger(__name__)
 # Constants
 BASE_URL = "https://www.samsung.com/uk"
 SITEMAP_URL = f"{BASE_URL}/info/sitemap/"
+XML_SITEMAP_URL = f"{BASE_URL}/sitemap.xml"
+MAX_SITEMAP_FETCHES = 20
+
+# Collects every JSON-LD script body in one page.evaluate round-trip
+_LD_SCRIPTS_JS = (
+    "() => Array.from(document.querySelectorAll("
+    "'script[type=\"application/ld+json\"]'"
+    ")).map(s => s.textContent)"
+)
 USER_AGENT = "Samsung-UK-Scraper/1.0 (contact: scraper@example.com)"
 
+# Recycle the browser context after this many pages; Playwright contexts
+# accumulate listener/route state on long runs, so periodic recreation keeps
+# RSS bounded
+PAGES_PER_CONTEXT = 50
+
+# Resource types aborted at the context level: extraction only needs the
+# HTML, JSON-LD scripts and XHR responses, and product pages are image-heavy
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
 # Fallback category URLs
 FALLBACK_URLS = [
     "/smartphones/all-smartphones/",
@@ -61,47 +100,387 @@ FALLBACK_URLS = [
     "/vacuum-cleaners/all-vacuum-cleaners/"
 ]
 
-class ProductSchema(BaseModel):
-    """Pydantic model for product data validation"""
-    url: str = Field(..., description="Product URL")
-    sku: Optional[str] = Field(None, description="Product SKU")
-    name: str = Field(..., description="Product name")
-    category: Optional[str] = Field(None, description="Main category")
-    sub_category: Optional[str] = Field(None, description="Sub category")
-    price_gbp: Optional[float] = Field(None, description="Price in GBP")
-    currency: Optional[str] = Field(None, description="Currency code")
-    availability: Optional[str] = Field(None, description="Availability status")
-    image_url: Optional[str] = Field(None, description="Product image URL")
-    timestamp_utc: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-    @field_validator('price_gbp', mode='before')
-    @classmethod
-    def parse_price(cls, v):
-        if v is None:
+# URL classifier patterns, compiled once into a single alternation each so a
+# candidate link costs one C-level scan instead of a per-pattern re.search loop
+_CATEGORY_PATTERNS = [
+    r'/smartphones/',
+    r'/tablets/',
+    r'/watches/',
+    r'/tvs/',
+    r'/monitors/',
+    r'/audio-sound/',
+    r'/refrigerators/',
+    r'/washers-and-dryers/',
+    r'/vacuum-cleaners/',
+    r'/all-',
+    r'/category/',
+    r'/products/',
+]
+_CATEGORY_RE = re.compile('|'.join(f'(?:{p})' for p in _CATEGORY_PATTERNS))
+
+_PRODUCT_PATTERNS = [
+    r'/galaxy-',
+    r'/buy-',
+    r'/\w+/[\w-]+/?$',  # Generic product pattern
+    r'/p/',  # Some sites use /p/ for products
+]
+_PRODUCT_RE = re.compile('|'.join(f'(?:{p})' for p in _PRODUCT_PATTERNS))
+
+# Price-cleanup regexes, compiled once rather than per call
+_PRICE_STRIP_RE = re.compile(r'[£$€,]')
+_PRICE_NUM_RE = re.compile(r'[\d,]+\.?\d*')
+
+# Upper bound on pagination pages enumerated per category via the recorded
+# XHR template; the loop also stops as soon as a page yields nothing new
+MAX_PAGINATION_PAGES = 20
+
+# URL-ish strings inside a pagination JSON payload (slashes may arrive
+# JSON-escaped; the payload is unescaped before this runs)
+_URL_IN_JSON_RE = re.compile(r'https?://[^"\s\\]+|/uk/[^"\s\\]+')
+
+# "Load more" button union, driven only when a listing batches on click
+# instead of announcing a pagination XHR during the render
+_LOAD_MORE_SELECTOR = 'button:has-text("Load more"), button:has-text("Show more"), .load-more'
+
+
+def _pagination_param(url: str) -> Optional[str]:
+    """Name of the offset/page query parameter in a pagination URL, if any"""
+    for key, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        if key.lower() in ('offset', 'page') and value.isdigit():
+            return key
+    return None
+
+
+def _pagination_url(template: str, param: str, value: int) -> str:
+    """Rewrite the offset/page parameter of a recorded pagination URL"""
+    parts = urlsplit(template)
+    params = [
+        (k, str(value) if k == param else v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+# Fallback selector unions, one comma-joined group per field: a single
+# css_first() call walks the tree once instead of once per alternative
+_NAME_SELECTOR = ', '.join((
+    'h1.product-title',
+    'h1.pdp-product-name',
+    '.product-name h1',
+    'h1[data-test="product-name"]',
+    '.pdp-product-name',
+))
+
+_PRICE_SELECTOR = ', '.join((
+    '.price-current',
+    '.price .current',
+    '[data-test="price"]',
+    '.product-price .current',
+    '.price-value',
+))
+
+_IMAGE_SELECTOR = ', '.join((
+    '.product-image img',
+    '.hero-image img',
+    '.pdp-image img',
+    '.product-gallery img',
+))
+
+_SKU_SELECTOR = ', '.join((
+    '[data-test="model-code"]',
+    '.model-code',
+    '.product-sku',
+    '.sku-value',
+))
+
+# Query parameters that only carry campaign/click tracking; stripping them
+# collapses variants of the same page into one canonical URL
+_TRACKING_PARAMS = {'cid', 'gclid', 'fbclid', 'yclid', 'mc'}
+
+
+def _canonicalize(url: str) -> str:
+    """Normalise a URL so cosmetic variants dedupe to one fetch.
+
+    Drops the fragment, strips tracking query parameters (modelCode and
+    other functional params survive), lowercases the host and removes a
+    trailing slash from non-root paths.
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith('utm_') and k not in _TRACKING_PARAMS
+    ])
+    path = parts.path
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+    return urlunsplit((parts.scheme, parts.netloc.lower(), path, query, ''))
+
+
+# Explicit Arrow schema mirroring ProductSchema, so the NDJSON-to-Parquet
+# conversion neither infers dtypes over the full dataset nor produces
+# pandas-style object columns
+_PRODUCT_ARROW_SCHEMA = pa.schema([
+    ('url', pa.string()),
+    ('sku', pa.string()),
+    ('name', pa.string()),
+    ('category', pa.string()),
+    ('sub_category', pa.string()),
+    ('price_gbp', pa.float64()),
+    ('currency', pa.string()),
+    ('availability', pa.string()),
+    ('image_url', pa.string()),
+    ('timestamp_utc', pa.string()),
+])
+
+
+def _parse_price(v) -> Optional[float]:
+    """Coerce a raw price value (string with currency symbols, number) to float"""
+    if v is None:
+        return None
+    if isinstance(v, str):
+        # Remove currency symbols and convert to float
+        price_str = _PRICE_STRIP_RE.sub('', v)
+        try:
+            return float(price_str)
+        except ValueError:
             return None
-        if isinstance(v, str):
-            # Remove currency symbols and convert to float
-            price_str = re.sub(r'[£$€,]', '', v)
-            try:
-                return float(price_str)
-            except ValueError:
-                return None
-        return float(v) if v else None
+    return float(v) if v else None
+
+
+class ProductSchema(msgspec.Struct, frozen=True):
+    """Product record; msgspec validates and serialises in C, which matters
+    because every record is encoded under the NDJSON writer lock"""
+    url: str
+    name: str
+    sku: Optional[str] = None
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    price_gbp: Optional[float] = None
+    currency: Optional[str] = None
+    availability: Optional[str] = None
+    image_url: Optional[str] = None
+    timestamp_utc: datetime = msgspec.field(default_factory=lambda: datetime.now(timezone.utc))
 
-    @field_validator('url')
     @classmethod
-    def validate_url(cls, v):
-        if not v.startswith('http'):
+    def from_raw(cls, url: str, name: str, price_gbp=None, **kwargs) -> "ProductSchema":
+        """Build a record from raw extracted values, normalising the price
+        and insisting on an absolute URL"""
+        if not url.startswith('http'):
             raise ValueError('URL must be absolute')
-        return v
+        return cls(url=url, name=name, price_gbp=_parse_price(price_gbp), **kwargs)
+
+
+def _first_if_list(v):
+    """First element of a list, or the value itself (never a string index)"""
+    if isinstance(v, list):
+        return v[0] if v else None
+    return v
+
+
+def _second_if_list(v):
+    """Second element of a list, else None — the old code indexed into the
+    already-unwrapped first element, turning 'TVs' into 'V'"""
+    if isinstance(v, list) and len(v) > 1:
+        return v[1]
+    return None
+
+
+def _image_value(v):
+    """Unwrap JSON-LD image shapes: list, ImageObject dict, or plain URL"""
+    if isinstance(v, list):
+        v = v[0] if v else None
+    if isinstance(v, dict):
+        v = v.get('url', v.get('@id'))
+    return v
+
+
+# Precompiled extraction spec for JSON-LD Product nodes: one glom() call
+# replaces the branch-heavy manual walk, and the callables handle the
+# list/dict/string shape variance explicitly
+_JSONLD_SPEC = {
+    'sku': Coalesce('sku', 'mpn', 'productID', default=None),
+    'name': Coalesce('name', default=''),
+    'price_gbp': Coalesce('offers.0.price', 'offers.price', default=None),
+    'currency': Coalesce('offers.0.priceCurrency', 'offers.priceCurrency', default='GBP'),
+    'availability': Coalesce('offers.0.availability', 'offers.availability', default=''),
+    'image_url': (Coalesce('image', default=None), _image_value),
+    'category': (Coalesce('category', default=None), _first_if_list),
+    'sub_category': (Coalesce('category', default=None), _second_if_list),
+}
+
+
+# One encoder instance reused for every NDJSON line
+_ENC = msgspec.json.Encoder()
+_DEC = msgspec.json.Decoder(ProductSchema)
+
+
+class URLCache:
+    """Persistent URL cache backing conditional GETs across runs.
+
+    Stores response validators (ETag/Last-Modified), a body hash and the
+    extracted product per canonical URL in a sqlite file, so nightly re-runs
+    turn unchanged pages into body-less 304s instead of full renders.
+    """
+
+    def __init__(self, path: str = 'cache.db'):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS url_cache '
+            '(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, sha1 TEXT, ts REAL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS products_cache '
+            '(url TEXT PRIMARY KEY, product TEXT)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pagination_templates '
+            '(category TEXT PRIMARY KEY, template TEXT)'
+        )
+        self._conn.commit()
+
+    def validators(self, url: str):
+        """Return (etag, last_modified) for a URL, or (None, None)"""
+        row = self._conn.execute(
+            'SELECT etag, last_modified FROM url_cache WHERE url = ?', (url,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def cached_product(self, url: str) -> Optional[ProductSchema]:
+        """Return the product stored for a URL, if any"""
+        row = self._conn.execute(
+            'SELECT product FROM products_cache WHERE url = ?', (url,)
+        ).fetchone()
+        if not row:
+            return None
+        try:
+            return _DEC.decode(row[0])
+        except msgspec.DecodeError:
+            return None
+
+    def store(self, url: str, etag, last_modified, body: bytes, product: ProductSchema):
+        """Record validators and the extracted product for a URL"""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO url_cache VALUES (?, ?, ?, ?, ?)',
+            (url, etag, last_modified, hashlib.sha1(body).hexdigest(), time.time()),
+        )
+        self._conn.execute(
+            'INSERT OR REPLACE INTO products_cache VALUES (?, ?)',
+            (url, _ENC.encode(product).decode()),
+        )
+        self._conn.commit()
+
+    def pagination_template(self, category: str) -> Optional[str]:
+        """Return the recorded pagination XHR URL for a category page"""
+        row = self._conn.execute(
+            'SELECT template FROM pagination_templates WHERE category = ?', (category,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store_pagination_template(self, category: str, template: str):
+        """Record the pagination XHR URL observed on a category page"""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO pagination_templates VALUES (?, ?)',
+            (category, template),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+class AdmissionGate:
+    """Resizable concurrency gate built on asyncio.Condition.
+
+    Unlike asyncio.Semaphore, the limit can change while coroutines are in
+    flight: shrinking stops new admissions until enough slots drain, growing
+    wakes waiters immediately. Lets the crawl back off when the server
+    starts pushing back instead of burning retries at full width.
+    """
+
+    def __init__(self, limit: int, floor: int = 1):
+        self.limit = limit
+        self.floor = floor
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int):
+        async with self._cond:
+            limit = max(self.floor, limit)
+            if limit > self.limit:
+                self.limit = limit
+                self._cond.notify_all()
+            else:
+                self.limit = limit
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+
+class TokenBucket:
+    """Token-bucket limiter enforcing a global requests-per-second budget.
+
+    Tokens refill continuously at `rate` per second up to `burst`; concurrent
+    workers draw from the same bucket, so politeness holds across the whole
+    crawl instead of each task sleeping a fixed delay on its own.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        # Total tokens ever handed out, i.e. requests admitted; lets the
+        # watcher report the measured request rate against `rate`
+        self.acquired = 0
+
+    async def acquire(self):
+        async with self._lock:
+            self.acquired += 1
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            wait = (1 - self._tokens) / self.rate
+            self._tokens = 0.0
+        await asyncio.sleep(wait)
+
 
 class SamsungUKScraper:
     def __init__(self, concurrency: int = 10):
         self.concurrency = concurrency
-        self.semaphore = asyncio.Semaphore(concurrency)
+        self.semaphore = AdmissionGate(concurrency)
+        # Reconfigured in run() once robots.txt reveals the crawl delay
+        self.rate_limiter = TokenBucket(rate=1.0, burst=concurrency)
+        self.cache = URLCache()
         self.session: Optional[aiohttp.ClientSession] = None
         self.playwright = None
         self.browser = None
+        self._context = None
+        self._pages_in_context = 0
+        self._context_lock = asyncio.Lock()
+        # Live page count per context plus contexts waiting to die: a
+        # recycled context must outlive the pages workers still drive
+        self._open_pages = {}
+        self._retired_contexts = set()
         
         # Statistics
         self.stats = {
@@ -110,26 +489,45 @@ class SamsungUKScraper:
             'successful_extractions': 0,
             'failed_extractions': 0,
             'retries': 0,
+            'throttled_responses': 0,
             'start_time': None,
             'end_time': None
         }
         
         # URL tracking
         self.discovered_urls: Set[str] = set()
+        self.seen_products: Set[str] = set()
         self.failed_urls: List[str] = []
-        self.products: List[ProductSchema] = []
+        
+        # Products stream to disk as they are extracted; only a counter
+        # stays in memory
+        self.products_saved = 0
+        self._ndjson_fh = None
+        self._write_lock = asyncio.Lock()
 
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=20)
+        # No global cap (limit=0): the per-host ceiling is the politeness
+        # control and tracks the configured concurrency, so workers never
+        # queue behind the connector's defaults
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
         timeout = aiohttp.ClientTimeout(total=30, connect=10)
         
         self.session = aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
-            headers={'User-Agent': USER_AGENT}
+            # Advertise brotli (needs the optional brotli package) so big
+            # listing pages travel compressed
+            headers={'User-Agent': USER_AGENT, 'Accept-Encoding': 'br, gzip, deflate'}
         )
         
+        self._ndjson_fh = open('products.ndjson', 'w', encoding='utf-8')
+        
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=True,
@@ -142,11 +540,104 @@ class SamsungUKScraper:
         """Async context manager exit"""
         if self.session:
             await self.session.close()
+        if self._ndjson_fh:
+            self._ndjson_fh.close()
+            self._ndjson_fh = None
+        self.cache.close()
+        for context in list(self._retired_contexts):
+            self._retired_contexts.discard(context)
+            try:
+                await context.close()
+            except Exception:
+                pass
+        if self._context:
+            await self._context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
 
+    @staticmethod
+    async def _route_filter(route):
+        """Abort requests for resources that extraction never needs"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire_page(self):
+        """Open a page on a shared context, recycling the context every
+        PAGES_PER_CONTEXT pages to keep memory bounded"""
+        async with self._context_lock:
+            if self._context is not None and self._pages_in_context >= PAGES_PER_CONTEXT:
+                # Swap in a fresh context immediately; the old one closes
+                # only once its last in-flight page is released, so no
+                # worker loses a live page mid-navigation
+                self._retire_context(self._context)
+                self._context = None
+            if self._context is None:
+                self._context = await self.browser.new_context(
+                    user_agent=USER_AGENT,
+                    locale='en-GB',
+                )
+                # One route on the context (not per page — routes are a
+                # known leak vector and die with the recycled context)
+                await self._context.route('**/*', self._route_filter)
+                self._pages_in_context = 0
+            self._pages_in_context += 1
+            page = await self._context.new_page()
+            self._open_pages[self._context] = self._open_pages.get(self._context, 0) + 1
+            # Page close is the release signal deferred retirement waits on
+            page.once('close', self._on_page_closed)
+            return page
+
+    def _retire_context(self, context):
+        """Mark a context for closing once its last page is released"""
+        if self._open_pages.get(context):
+            self._retired_contexts.add(context)
+        else:
+            asyncio.ensure_future(self._close_context(context))
+
+    def _on_page_closed(self, page):
+        """Decrement the owning context's live-page count; close retired
+        contexts when it reaches zero"""
+        context = page.context
+        remaining = self._open_pages.get(context, 1) - 1
+        if remaining > 0:
+            self._open_pages[context] = remaining
+            return
+        self._open_pages.pop(context, None)
+        if context in self._retired_contexts:
+            self._retired_contexts.discard(context)
+            asyncio.ensure_future(self._close_context(context))
+
+    @staticmethod
+    async def _close_context(context):
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _parse_tree(html):
+        """Parse HTML (str or bytes) with Lexbor when available, bs4+lxml
+        otherwise; both accept bytes, avoiding an up-front str decode"""
+        if LexborHTMLParser is not None:
+            return LexborHTMLParser(html)
+        return BeautifulSoup(html, 'lxml')
+
+    @staticmethod
+    def _iter_hrefs(tree):
+        """Yield every href attribute in the document"""
+        if LexborHTMLParser is not None and isinstance(tree, LexborHTMLParser):
+            for node in tree.css('a[href]'):
+                href = node.attributes.get('href')
+                if href:
+                    yield href
+        else:
+            for link in tree.find_all('a', href=True):
+                yield link['href']
+
     async def get_robots_delay(self) -> float:
         """Get crawl delay from robots.txt"""
         try:
@@ -163,23 +654,68 @@ class SamsungUKScraper:
         
         return 1.0  # Default 1 second delay
 
-    async def discover_urls_from_sitemap(self) -> Set[str]:
-        """Discover product URLs from Samsung UK sitemap"""
-        logger.info("Discovering URLs from sitemap...")
+    @staticmethod
+    def _iter_sitemap_locs(data: bytes):
+        """Yield <loc> values from sitemap XML without building a full DOM"""
+        try:
+            from io import BytesIO
+            from lxml import etree
+            for _, elem in etree.iterparse(BytesIO(data), events=('end',), tag='{*}loc'):
+                if elem.text:
+                    yield elem.text.strip()
+                elem.clear()
+        except Exception:
+            # Malformed XML or lxml unavailable: a byte regex still finds
+            # the loc entries
+            for match in re.finditer(rb'<loc>\s*([^<]+?)\s*</loc>', data):
+                yield match.group(1).decode('utf-8', errors='replace')
+
+    async def _discover_from_xml_sitemap(self) -> Set[str]:
+        """Walk sitemap.xml (recursing into sitemap indexes) for category URLs"""
+        urls = set()
+        queue = [XML_SITEMAP_URL]
+        seen = set()
+        
+        while queue and len(seen) < MAX_SITEMAP_FETCHES:
+            sitemap_url = queue.pop()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            
+            try:
+                await self.rate_limiter.acquire()
+                async with self.session.get(sitemap_url) as response:
+                    if response.status != 200:
+                        logger.debug(f"Sitemap fetch {sitemap_url}: HTTP {response.status}")
+                        continue
+                    data = await response.read()
+            except Exception as e:
+                logger.debug(f"Sitemap fetch failed for {sitemap_url}: {e}")
+                continue
+            
+            for loc in self._iter_sitemap_locs(data):
+                if re.search(r'sitemap[^/]*\.xml', loc):
+                    queue.append(loc)
+                elif 'samsung.com/uk' in loc and self._is_product_category_url(loc):
+                    urls.add(_canonicalize(loc))
+        
+        return urls
+
+    async def _discover_from_html_sitemap(self) -> Set[str]:
+        """Legacy fallback: scrape the human-readable sitemap page"""
         urls = set()
         
         try:
+            await self.rate_limiter.acquire()
             async with self.session.get(SITEMAP_URL) as response:
                 if response.status != 200:
                     logger.warning(f"Sitemap fetch failed: {response.status}")
                     return urls
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                tree = self._parse_tree(await response.read())
                 
                 # Find all links under "Shop" section
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
+                for href in self._iter_hrefs(tree):
                     if href.startswith('/'):
                         full_url = BASE_URL + href
                     elif href.startswith('http'):
@@ -189,12 +725,24 @@ class SamsungUKScraper:
                     
                     # Filter for Samsung UK shop URLs
                     if 'samsung.com/uk' in full_url and self._is_product_category_url(full_url):
-                        urls.add(full_url)
+                        urls.add(_canonicalize(full_url))
                         logger.debug(f"Discovered category URL: {full_url}")
         
         except Exception as e:
             logger.error(f"Error discovering URLs from sitemap: {e}")
         
+        return urls
+
+    async def discover_urls_from_sitemap(self) -> Set[str]:
+        """Discover category URLs, preferring the XML sitemap"""
+        logger.info("Discovering URLs from sitemap...")
+        
+        # The real sitemap is multi-megabyte XML; stream-parse it rather
+        # than scraping the HTML sitemap page with an HTML parser
+        urls = await self._discover_from_xml_sitemap()
+        if not urls:
+            urls = await self._discover_from_html_sitemap()
+        
         # Add fallback URLs
         for fallback in FALLBACK_URLS:
             full_url = BASE_URL + fallback
@@ -206,22 +754,7 @@ class SamsungUKScraper:
 
     def _is_product_category_url(self, url: str) -> bool:
         """Check if URL is a product category or listing page"""
-        category_patterns = [
-            r'/smartphones/',
-            r'/tablets/',
-            r'/watches/',
-            r'/tvs/',
-            r'/monitors/',
-            r'/audio-sound/',
-            r'/refrigerators/',
-            r'/washers-and-dryers/',
-            r'/vacuum-cleaners/',
-            r'/all-',
-            r'/category/',
-            r'/products/'
-        ]
-        
-        return any(re.search(pattern, url) for pattern in category_patterns)
+        return bool(_CATEGORY_RE.search(url))
 
     async def discover_product_urls_from_category(self, category_url: str) -> Set[str]:
         """Discover individual product URLs from a category page"""
@@ -229,20 +762,19 @@ class SamsungUKScraper:
         
         try:
             # Try static first
+            await self.rate_limiter.acquire()
             async with self.session.get(category_url) as response:
                 if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    tree = self._parse_tree(await response.read())
                     
                     # Look for product links
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
+                    for href in self._iter_hrefs(tree):
                         if self._is_product_detail_url(href):
                             if href.startswith('/'):
                                 full_url = BASE_URL + href
                             else:
                                 full_url = href
-                            product_urls.add(full_url)
+                            product_urls.add(_canonicalize(full_url))
             
             # If few products found, try dynamic scraping
             if len(product_urls) < 5:
@@ -258,35 +790,60 @@ class SamsungUKScraper:
     def _is_product_detail_url(self, url: str) -> bool:
         """Check if URL is a product detail page"""
         # Samsung product URLs typically have model numbers or specific patterns
-        product_patterns = [
-            r'/galaxy-',
-            r'/buy-',
-            r'/\w+/[\w-]+/?$',  # Generic product pattern
-            r'/p/',  # Some sites use /p/ for products
-        ]
-        
-        return any(re.search(pattern, url) for pattern in product_patterns)
+        return bool(_PRODUCT_RE.search(url))
 
     async def _discover_urls_dynamic(self, url: str) -> Set[str]:
-        """Use Playwright to discover URLs from dynamic content"""
+        """Discover URLs from dynamic listings via the pagination API.
+
+        The listing loads batches through an XHR carrying an offset/page
+        query parameter. The first render records that URL (persisted per
+        category), and every batch after the first — this run and all later
+        runs — comes from plain GETs against it instead of driving
+        "Load more" clicks through Playwright.
+        """
         product_urls = set()
         
+        template = self.cache.pagination_template(url)
+        if template:
+            return await self._paginate_with_template(template)
+        
+        page = None
         try:
-            page = await self.browser.new_page()
-            await page.goto(url, wait_until='networkidle')
+            page = await self._acquire_page()
             
-            # Handle "Load more" buttons
-            load_more_attempts = 0
-            while load_more_attempts < 10:  # Prevent infinite loops
-                load_more_button = await page.query_selector('button:has-text("Load more"), button:has-text("Show more"), .load-more')
-                if load_more_button:
-                    await load_more_button.click()
-                    await page.wait_for_timeout(2000)
-                    load_more_attempts += 1
-                else:
+            # Record the first JSON pagination request the listing makes
+            captured = {}
+            def record_pagination(response):
+                if captured:
+                    return
+                if 'offset=' not in response.url and 'page=' not in response.url:
+                    return
+                if 'json' not in (response.headers.get('content-type') or ''):
+                    return
+                if _pagination_param(response.url):
+                    captured['url'] = response.url
+            page.on('response', record_pagination)
+            
+            await page.goto(url, wait_until='domcontentloaded', timeout=20000)
+            try:
+                await page.wait_for_selector('a[href]', timeout=10000)
+            except Exception:
+                pass
+            
+            # Click-triggered batching is common: when the render fired no
+            # pagination XHR, drive "Load more" as the fallback — a click
+            # can itself fire the XHR, at which point the loop stops and
+            # the recorded endpoint takes over
+            load_attempts = 0
+            while not captured and load_attempts < 10:
+                load_more_button = await page.query_selector(_LOAD_MORE_SELECTOR)
+                if load_more_button is None or not await load_more_button.is_visible():
                     break
+                await load_more_button.click()
+                await page.wait_for_timeout(2000)
+                load_attempts += 1
             
-            # Extract product links
+            # Extract the links rendered so far
             links = await page.query_selector_all('a[href]')
             for link in links:
                 href = await link.get_attribute('href')
@@ -295,15 +852,68 @@ class SamsungUKScraper:
                         full_url = BASE_URL + href
                     else:
                         full_url = href
-                    product_urls.add(full_url)
+                    product_urls.add(_canonicalize(full_url))
             
-            await page.close()
+            if captured:
+                self.cache.store_pagination_template(url, captured['url'])
+                product_urls.update(await self._paginate_with_template(captured['url']))
             
         except Exception as e:
             logger.error(f"Error in dynamic URL discovery for {url}: {e}")
+        finally:
+            # Detach and close on every exit so a goto/selector timeout
+            # cannot leak the page or its listener into the shared context
+            if page is not None:
+                try:
+                    page.remove_listener('response', record_pagination)
+                except Exception:
+                    pass
+                try:
+                    await page.close()
+                except Exception:
+                    pass
         
         return product_urls
 
+    async def _paginate_with_template(self, template: str) -> Set[str]:
+        """Enumerate a recorded pagination URL with plain GETs.
+
+        Walks the offset/page parameter until a batch yields no new product
+        URLs; product links are pulled straight out of the JSON payload.
+        """
+        product_urls = set()
+        param = _pagination_param(template)
+        if not param:
+            return product_urls
+        
+        step = 1 if param.lower() == 'page' else 24
+        for i in range(1, MAX_PAGINATION_PAGES + 1):
+            page_url = _pagination_url(template, param, i * step)
+            try:
+                await self.rate_limiter.acquire()
+                async with self.session.get(page_url) as response:
+                    if response.status != 200:
+                        break
+                    payload = await response.text()
+            except Exception as e:
+                logger.debug(f"Pagination fetch failed for {page_url}: {e}")
+                break
+            
+            batch = set()
+            for candidate in _URL_IN_JSON_RE.findall(payload.replace('\\/', '/')):
+                if self._is_product_detail_url(candidate):
+                    if candidate.startswith('/'):
+                        candidate = BASE_URL.rsplit('/uk', 1)[0] + candidate
+                    batch.add(_canonicalize(candidate))
+            
+            new = batch - product_urls
+            if not new:
+                break
+            product_urls.update(new)
+        
+        logger.info(f"Pagination template yielded {len(product_urls)} product URLs")
+        return product_urls
+
     @retry(
         stop=stop_after_attempt(4),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -330,20 +940,48 @@ class SamsungUKScraper:
     async def _fetch_static(self, url: str) -> Optional[ProductSchema]:
         """Fetch product data using static HTTP request"""
         try:
-            async with self.session.get(url) as response:
+            # Conditional request: unchanged pages come back as a body-less
+            # 304 and are served from the sqlite cache
+            headers = {}
+            etag, last_modified = self.cache.validators(url)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            
+            await self.rate_limiter.acquire()
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    cached = self.cache.cached_product(url)
+                    if cached:
+                        logger.debug(f"304 Not Modified, using cached product for {url}")
+                        return cached
+                    return None
+                
                 if response.status != 200:
+                    if response.status == 429 or response.status >= 500:
+                        self.stats['throttled_responses'] += 1
                     return None
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                body = await response.read()
+                tree = self._parse_tree(body)
                 
                 # Try JSON-LD first
-                product_data = self._extract_from_json_ld(soup, url)
+                product_data = self._extract_from_json_ld(tree, url)
+                if not product_data:
+                    # Fallback to CSS selectors
+                    product_data = self._extract_from_css_selectors(tree, url)
+                
                 if product_data:
-                    return product_data
+                    self.cache.store(
+                        url,
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'),
+                        body,
+                        product_data,
+                    )
                 
-                # Fallback to CSS selectors
-                return self._extract_from_css_selectors(soup, url)
+                return product_data
                 
         except Exception as e:
             logger.debug(f"Static fetch failed for {url}: {e}")
@@ -351,70 +989,131 @@ class SamsungUKScraper:
 
     async def _fetch_dynamic(self, url: str) -> Optional[ProductSchema]:
         """Fetch product data using Playwright"""
+        page = None
         try:
-            page = await self.browser.new_page()
+            page = await self._acquire_page()
             
-            # Intercept JSON responses
+            # Intercept JSON responses — only plausible product API calls,
+            # and capped so response bodies cannot pile up in memory
             json_data = {}
+            json_data_size = 0
             async def handle_response(response):
+                nonlocal json_data_size
+                if json_data_size >= 256 * 1024:
+                    return
+                if '/api/' not in response.url and '/pd/' not in response.url:
+                    return
                 if 'json' in response.headers.get('content-type', ''):
                     try:
                         data = await response.json()
-                        json_data.update(data)
+                        if isinstance(data, dict):
+                            json_data.update(data)
+                            json_data_size += len(str(data))
                     except:
                         pass
             
             page.on('response', handle_response)
             
-            await page.goto(url, wait_until='networkidle')
-            
-            # Extract data
-            html = await page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+            # Wait only for the markers extraction actually reads, not for
+            # the long tail of analytics beacons to go quiet
+            await page.goto(url, wait_until='domcontentloaded', timeout=20000)
+            try:
+                await page.wait_for_selector(
+                    'script[type="application/ld+json"], h1.product-title, h1.pdp-product-name',
+                    timeout=10000,
+                )
+            except Exception:
+                pass
             
-            # Try JSON-LD first
-            product_data = self._extract_from_json_ld(soup, url)
+            # Pull JSON-LD straight out of the live DOM: one evaluate call,
+            # no HTML round-trip, no parser construction
+            ld_texts = await page.evaluate(_LD_SCRIPTS_JS)
+            product_data = self._product_from_script_texts(ld_texts or [], url)
             if product_data:
-                await page.close()
                 return product_data
             
             # Try intercepted JSON
             if json_data:
                 product_data = self._extract_from_intercepted_json(json_data, url)
                 if product_data:
-                    await page.close()
                     return product_data
             
-            # Fallback to CSS selectors
-            product_data = self._extract_from_css_selectors(soup, url)
-            await page.close()
-            return product_data
+            # Only now pay for the full HTML serialisation + parse, solely
+            # for the CSS-selector fallback
+            html = await page.content()
+            tree = self._parse_tree(html)
+            return self._extract_from_css_selectors(tree, url)
             
         except Exception as e:
             logger.debug(f"Dynamic fetch failed for {url}: {e}")
             return None
+        finally:
+            # The shared context outlives this page: detach the listener
+            # (breaking its retention chain) and close the page on every
+            # exit, or failed fetches would leak both into the pool
+            if page is not None:
+                try:
+                    page.remove_listener('response', handle_response)
+                except Exception:
+                    pass
+                try:
+                    await page.close()
+                except Exception:
+                    pass
 
-    def _extract_from_json_ld(self, soup: BeautifulSoup, url: str) -> Optional[ProductSchema]:
+    @staticmethod
+    def _json_ld_scripts(tree) -> List[str]:
+        """Return the text of every JSON-LD script in the document"""
+        if LexborHTMLParser is not None and isinstance(tree, LexborHTMLParser):
+            return [node.text() for node in tree.css('script[type="application/ld+json"]')]
+        return [s.string for s in tree.find_all('script', type='application/ld+json')]
+
+    @staticmethod
+    def _loads(text):
+        """Decode a JSON document with orjson when available"""
+        if orjson is not None:
+            return orjson.loads(text)
+        return json.loads(text)
+
+    def _extract_from_json_ld(self, tree, url: str) -> Optional[ProductSchema]:
         """Extract product data from JSON-LD structured data"""
+        return self._product_from_script_texts(self._json_ld_scripts(tree), url)
+
+    def _product_from_script_texts(self, script_texts, url: str) -> Optional[ProductSchema]:
+        """Build a product from an iterable of JSON-LD script bodies"""
         try:
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            
-            for script in json_ld_scripts:
+            for script_text in script_texts:
+                if not script_text:
+                    continue
+                
+                # Cheap substring probe: skip breadcrumb/review/org blobs
+                # without paying for a decode at all
+                if 'Product' not in script_text and 'product' not in script_text:
+                    continue
+                
                 try:
-                    data = json.loads(script.string)
+                    data = self._loads(script_text)
                     
                     # Handle different JSON-LD structures
                     if isinstance(data, list):
                         data = data[0]
+                    if not isinstance(data, dict):
+                        continue
                     
                     if data.get('@type') == 'Product':
                         return self._create_product_from_json_ld(data, url)
                     
+                    # Walk @graph arrays — the common
+                    # {"@context": ..., "@graph": [...]} shape
+                    for node in data.get('@graph') or []:
+                        if isinstance(node, dict) and node.get('@type') == 'Product':
+                            return self._create_product_from_json_ld(node, url)
+                    
                     # Check for nested products
-                    if 'product' in data:
+                    if isinstance(data.get('product'), dict):
                         return self._create_product_from_json_ld(data['product'], url)
                         
-                except (json.JSONDecodeError, KeyError) as e:
+                except (ValueError, KeyError) as e:
                     logger.debug(f"JSON-LD parsing error for {url}: {e}")
                     continue
             
@@ -424,84 +1123,30 @@ class SamsungUKScraper:
         return None
 
     def _create_product_from_json_ld(self, data: dict, url: str) -> Optional[ProductSchema]:
-        """Create ProductSchema from JSON-LD data"""
+        """Create ProductSchema from JSON-LD data via the precompiled spec"""
         try:
-            # Extract offers data
-            offers = data.get('offers', {})
-            if isinstance(offers, list):
-                offers = offers[0] if offers else {}
-            
-            # Extract image
-            image = data.get('image')
-            if isinstance(image, list):
-                image = image[0] if image else None
-            if isinstance(image, dict):
-                image = image.get('url', image.get('@id'))
+            fields = glom(data, _JSONLD_SPEC)
             
-            # Extract category
-            category = data.get('category')
-            sub_category = None
-            if isinstance(category, list):
-                category = category[0] if category else None
-                sub_category = category[1] if len(category) > 1 else None
+            image = fields['image_url']
+            if image and image.startswith('/'):
+                fields['image_url'] = BASE_URL + image
             
-            product = ProductSchema(
-                url=url,
-                sku=data.get('sku', data.get('mpn', data.get('productID'))),
-                name=data.get('name', ''),
-                category=category,
-                sub_category=sub_category,
-                price_gbp=offers.get('price'),
-                currency=offers.get('priceCurrency', 'GBP'),
-                availability=offers.get('availability', '').replace('https://schema.org/', ''),
-                image_url=image
-            )
+            fields['availability'] = (fields['availability'] or '').replace('https://schema.org/', '')
             
-            return product
+            return ProductSchema.from_raw(url=url, **fields)
             
         except Exception as e:
             logger.debug(f"Error creating product from JSON-LD: {e}")
             return None
 
-    def _extract_from_css_selectors(self, soup: BeautifulSoup, url: str) -> Optional[ProductSchema]:
+    def _extract_from_css_selectors(self, tree, url: str) -> Optional[ProductSchema]:
         """Extract product data using CSS selectors as fallback"""
         try:
-            # Common Samsung UK CSS selectors
-            name_selectors = [
-                'h1.product-title',
-                'h1.pdp-product-name',
-                '.product-name h1',
-                'h1[data-test="product-name"]',
-                '.pdp-product-name'
-            ]
-            
-            price_selectors = [
-                '.price-current',
-                '.price .current',
-                '[data-test="price"]',
-                '.product-price .current',
-                '.price-value'
-            ]
-            
-            image_selectors = [
-                '.product-image img',
-                '.hero-image img',
-                '.pdp-image img',
-                '.product-gallery img'
-            ]
-            
-            sku_selectors = [
-                '[data-test="model-code"]',
-                '.model-code',
-                '.product-sku',
-                '.sku-value'
-            ]
-            
-            # Extract data
-            name = self._extract_text_by_selectors(soup, name_selectors)
-            price_text = self._extract_text_by_selectors(soup, price_selectors)
-            image_url = self._extract_attr_by_selectors(soup, image_selectors, 'src')
-            sku = self._extract_text_by_selectors(soup, sku_selectors)
+            # One query per field against the module-level selector unions
+            name = self._extract_text(tree, _NAME_SELECTOR)
+            price_text = self._extract_text(tree, _PRICE_SELECTOR)
+            image_url = self._extract_attr(tree, _IMAGE_SELECTOR, 'src')
+            sku = self._extract_text(tree, _SKU_SELECTOR)
             
             if not name:
                 return None
@@ -509,7 +1154,7 @@ class SamsungUKScraper:
             # Parse price
             price_gbp = None
             if price_text:
-                price_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
+                price_match = _PRICE_NUM_RE.search(price_text.replace(',', ''))
                 if price_match:
                     price_gbp = float(price_match.group())
             
@@ -517,7 +1162,7 @@ class SamsungUKScraper:
             if image_url and image_url.startswith('/'):
                 image_url = BASE_URL + image_url
             
-            product = ProductSchema(
+            product = ProductSchema.from_raw(
                 url=url,
                 sku=sku,
                 name=name,
@@ -532,21 +1177,21 @@ class SamsungUKScraper:
             logger.debug(f"CSS selector extraction failed for {url}: {e}")
             return None
 
-    def _extract_text_by_selectors(self, soup: BeautifulSoup, selectors: List[str]) -> Optional[str]:
-        """Extract text using list of CSS selectors"""
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element:
-                return element.get_text(strip=True)
-        return None
+    def _extract_text(self, tree, selector: str) -> Optional[str]:
+        """Extract text for a (possibly comma-joined) CSS selector"""
+        if LexborHTMLParser is not None and isinstance(tree, LexborHTMLParser):
+            node = tree.css_first(selector)
+            return node.text(strip=True) if node else None
+        element = tree.select_one(selector)
+        return element.get_text(strip=True) if element else None
 
-    def _extract_attr_by_selectors(self, soup: BeautifulSoup, selectors: List[str], attr: str) -> Optional[str]:
-        """Extract attribute using list of CSS selectors"""
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element and element.get(attr):
-                return element[attr]
-        return None
+    def _extract_attr(self, tree, selector: str, attr: str) -> Optional[str]:
+        """Extract an attribute for a (possibly comma-joined) CSS selector"""
+        if LexborHTMLParser is not None and isinstance(tree, LexborHTMLParser):
+            node = tree.css_first(selector)
+            return node.attributes.get(attr) if node else None
+        element = tree.select_one(selector)
+        return element.get(attr) if element else None
 
     def _extract_from_intercepted_json(self, json_data: dict, url: str) -> Optional[ProductSchema]:
         """Extract product data from intercepted JSON responses"""
@@ -558,23 +1203,38 @@ class SamsungUKScraper:
             logger.debug(f"Intercepted JSON extraction failed for {url}: {e}")
             return None
 
-    async def save_products_ndjson(self, filename: str = 'products.ndjson'):
-        """Save products to NDJSON file"""
-        logger.info(f"Saving {len(self.products)} products to {filename}")
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            for product in self.products:
-                json_line = product.model_dump_json()
-                f.write(json_line + '\n')
+    async def write_product(self, product: ProductSchema):
+        """Append one product to the NDJSON stream"""
+        async with self._write_lock:
+            self._ndjson_fh.write(_ENC.encode(product).decode())
+            self._ndjson_fh.write('\n')
+            self.products_saved += 1
 
     async def save_products_parquet(self, filename: str = 'products.parquet'):
-        """Convert NDJSON to Parquet format"""
+        """Convert the streamed NDJSON to Parquet format"""
         logger.info(f"Converting to Parquet format: {filename}")
         
+        # Flush pending lines so the reader sees the full crawl
+        async with self._write_lock:
+            self._ndjson_fh.flush()
+        
+        if not self.products_saved:
+            logger.warning("No products to convert to Parquet")
+            return
+        
         try:
-            # Read NDJSON and convert to DataFrame
-            df = pd.read_json('products.ndjson', lines=True)
-            df.to_parquet(filename, engine='pyarrow')
+            # pyarrow's native NDJSON reader with the explicit schema avoids
+            # both a pandas round-trip and full-dataset dtype inference
+            table = pa_json.read_json(
+                'products.ndjson',
+                read_options=pa_json.ReadOptions(block_size=8 << 20),
+                parse_options=pa_json.ParseOptions(explicit_schema=_PRODUCT_ARROW_SCHEMA),
+            )
+            # Flush in bounded row groups so the writer never holds more
+            # than one group's worth of encoded data
+            with pq.ParquetWriter(filename, _PRODUCT_ARROW_SCHEMA, compression='zstd') as writer:
+                for batch in table.to_batches(max_chunksize=64 * 1024):
+                    writer.write_batch(batch)
             logger.info(f"Parquet file saved: {filename}")
         except Exception as e:
             logger.error(f"Error saving Parquet file: {e}")
@@ -608,55 +1268,92 @@ class SamsungUKScraper:
         self.stats['start_time'] = datetime.now(timezone.utc)
         logger.info("Starting Samsung UK product scraping...")
         
-        # Get crawl delay
+        # Get crawl delay and size the token bucket from it: the bucket
+        # enforces the robots.txt rate globally, so nothing below needs to
+        # sleep per URL
         crawl_delay = await self.get_robots_delay()
+        self.rate_limiter = TokenBucket(rate=1.0 / max(crawl_delay, 0.1), burst=self.concurrency)
         logger.info(f"Using crawl delay: {crawl_delay} seconds")
         
         # Discover category URLs
         category_urls = await self.discover_urls_from_sitemap()
         
         # Discover product URLs from all categories
+        # Categories are independent, so discover them concurrently; the
+        # token bucket keeps the aggregate request rate polite
         all_product_urls = set()
-        for category_url in category_urls:
-            product_urls = await self.discover_product_urls_from_category(category_url)
-            all_product_urls.update(product_urls)
-            await asyncio.sleep(crawl_delay)  # Respect rate limit
+        results = await asyncio.gather(
+            *(self.discover_product_urls_from_category(u) for u in category_urls),
+            return_exceptions=True,
+        )
+        for category_url, result in zip(category_urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"Category discovery failed for {category_url}: {result}")
+                continue
+            all_product_urls.update(result)
         
         self.stats['discovered_urls'] = len(all_product_urls)
         logger.info(f"Total product URLs discovered: {len(all_product_urls)}")
         
-        # Process products in batches
-        semaphore = asyncio.Semaphore(self.concurrency)
-        
+        # Process products; fetch_product_data already gates on
+        # self.semaphore, so no second semaphore here
         async def process_url(url):
-            async with semaphore:
-                try:
-                    product = await self.fetch_product_data(url)
-                    if product:
-                        self.products.append(product)
-                        self.stats['successful_extractions'] += 1
-                        logger.debug(f"Successfully extracted: {product.name}")
-                    else:
-                        self.failed_urls.append(url)
-                        self.stats['failed_extractions'] += 1
-                        logger.debug(f"Failed to extract: {url}")
-                    
-                    self.stats['processed_urls'] += 1
-                    
-                    # Rate limiting
-                    await asyncio.sleep(crawl_delay)
-                    
-                except Exception as e:
+            # Canonical-URL guard: retries and mirror links must not
+            # re-scrape a page this run already handled
+            if url in self.seen_products:
+                return
+            self.seen_products.add(url)
+            try:
+                product = await self.fetch_product_data(url)
+                if product:
+                    await self.write_product(product)
+                    self.stats['successful_extractions'] += 1
+                    logger.debug(f"Successfully extracted: {product.name}")
+                else:
                     self.failed_urls.append(url)
                     self.stats['failed_extractions'] += 1
-                    logger.error(f"Error processing {url}: {e}")
+                    logger.debug(f"Failed to extract: {url}")
+                
+                self.stats['processed_urls'] += 1
+                
+            except Exception as e:
+                self.failed_urls.append(url)
+                self.stats['failed_extractions'] += 1
+                logger.error(f"Error processing {url}: {e}")
         
-        # Execute all tasks
-        tasks = [process_url(url) for url in all_product_urls]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Watch for server push-back and adapt the admission limit: shrink
+        # one slot per throttled window, creep back up when things calm down.
+        # Also log the measured request rate so the token bucket can be
+        # checked against its configured budget in the field
+        async def adjust_concurrency():
+            seen_throttled = self.stats['throttled_responses']
+            seen_acquired = self.rate_limiter.acquired
+            while True:
+                await asyncio.sleep(10)
+                acquired = self.rate_limiter.acquired
+                logger.info(
+                    f"Pace: {(acquired - seen_acquired) / 10:.2f} req/s measured "
+                    f"(budget {self.rate_limiter.rate:.2f} req/s)"
+                )
+                seen_acquired = acquired
+                throttled = self.stats['throttled_responses']
+                if throttled > seen_throttled:
+                    await self.semaphore.set_limit(self.semaphore.limit - 1)
+                    logger.info(f"Server push-back: concurrency lowered to {self.semaphore.limit}")
+                elif self.semaphore.limit < self.concurrency:
+                    await self.semaphore.set_limit(self.semaphore.limit + 1)
+                    logger.info(f"Recovered: concurrency raised to {self.semaphore.limit}")
+                seen_throttled = throttled
+        
+        adjuster = asyncio.create_task(adjust_concurrency())
+        try:
+            # Execute all tasks
+            tasks = [process_url(url) for url in all_product_urls]
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            adjuster.cancel()
         
-        # Save results
-        await self.save_products_ndjson()
+        # Save results (NDJSON has been streaming throughout the crawl)
         await self.save_products_parquet()
         await self.save_failed_urls()
         
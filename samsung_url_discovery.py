@@ -12,18 +12,39 @@ Usage:
 """
 
 import asyncio
+import functools
 import json
 import logging
 import re
 from datetime import datetime, timezone
 from typing import List, Set, Dict, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 import argparse
 
-import aiohttp
+import httpx
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 
+# selectolax parses HTML in C (Modest engine), roughly an order of magnitude
+# faster than bs4 for pulling out hrefs; fall back to bs4+lxml when missing
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# google-re2 compiles the classifier unions to a linear-time DFA, immune to
+# backtracking blowup on pathological URLs; fall back to stdlib re when missing
+try:
+    import re2 as _url_re
+except ImportError:
+    _url_re = re
+
+# orjson serializes the metadata dict at C speed; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,18 +61,351 @@ BASE_URL = "https://www.samsung.com/uk"
 SITEMAP_URL = f"{BASE_URL}/info/sitemap/"
 USER_AGENT = "Samsung-UK-URL-Discovery/1.0 (contact: scraper@example.com)"
 
+# Resource types aborted in the shared browser context; discovery only needs
+# the DOM and the scripts that build it
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# Pages kept warm in the pool for dynamic discovery
+PAGE_POOL_SIZE = 4
+
+# Upper bound on listing-API pages fetched per category; the loop also stops
+# as soon as a page yields no new product URLs
+MAX_LISTING_PAGES = 20
+
+# Ceiling on category pages enqueued per run, counting sub-categories found
+# while crawling; keeps the dynamic work queue from chasing the whole site
+MAX_CATEGORY_PAGES = 200
+
+# Sections whose product grids are rendered entirely client-side: the
+# static fetch never yields product links there (measured on first runs),
+# so discovery jumps straight to the browser/listing-API path
+JS_ONLY_CATEGORIES = frozenset({'tvs', 'smartphones', 'tablets', 'watches', 'audio-sound'})
+
+# Relative discovery cost per storefront section, from observed crawl times
+# (TV and phone listings page the deepest). Used to start the heavy
+# categories first so the slowest one doesn't end up scheduled last
+CATEGORY_WEIGHTS = {
+    'tvs': 10,
+    'smartphones': 8,
+    'monitors': 6,
+    'audio-sound': 6,
+    'refrigerators': 5,
+    'washers-and-dryers': 5,
+    'tablets': 4,
+    'watches': 4,
+    'computers': 4,
+    'vacuum-cleaners': 3,
+    'dishwashers': 2,
+    'microwave-ovens': 2,
+    'projectors': 2,
+    'memory-storage': 1,
+}
+
+# URL-ish strings inside a listing JSON payload (payload is unescaped first)
+_URL_IN_JSON_RE = re.compile(r'https?://[^"\s\\]+|/uk/[^"\s\\]+')
+
+
+def _listing_page_param(url: str) -> Optional[str]:
+    """Name of the page/offset query parameter in a listing URL, if any"""
+    for key, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        if key.lower() in ('page', 'offset') and value.isdigit():
+            return key
+    return None
+
+
+def _listing_page_url(endpoint: str, param: str, value: int) -> str:
+    """Rewrite the page/offset parameter of a recorded listing URL"""
+    parts = urlsplit(endpoint)
+    params = [
+        (k, str(value) if k == param else v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+# First path segments that mark non-catalogue Samsung UK pages. The old
+# check scanned the whole URL for these as substrings, which was both more
+# work and occasionally wrong (a match inside a query string would fire);
+# they are really a blocklist on the section the URL lives under
+_EXCLUDED_SEGMENTS = frozenset({
+    'info', 'support', 'business', 'offer', 'estore',
+    'legal', 'privacy', 'sustainability', 'mypage',
+    'members', 'account', 'login', 'register', 'cart',
+})
+
+_CATEGORY_PATTERNS = (
+    # Mobile & Wearables
+    r'/smartphones/',
+    r'/tablets/',
+    r'/watches/',
+    r'/computers/',
+    r'/audio-sound/',
+    r'/mobile-accessories/',
+
+    # TV & AV
+    r'/tvs/',
+    r'/neo-qled-tvs/',
+    r'/oled-tvs/',
+    r'/qled-tv/',
+    r'/lifestyle-tvs/',
+    r'/audio-devices/',
+
+    # Home Appliances
+    r'/refrigerators/',
+    r'/washers-and-dryers/',
+    r'/dishwashers/',
+    r'/cooking-appliances/',
+    r'/microwave-ovens/',
+    r'/vacuum-cleaners/',
+
+    # Computing & Storage
+    r'/monitors/',
+    r'/memory-storage/',
+
+    # Business
+    r'/business/projectors/',
+    r'/projectors/',
+
+    # Generic patterns
+    r'/all-',
+    r'/category/',
+    r'/products/',
+)
+
+_PRODUCT_PATTERNS = (
+    # Galaxy device patterns
+    r'/galaxy-[^/]+/$',  # Galaxy product pages (not /buy/)
+    r'/galaxy-watch[^/]*-[^/]+-[^/]+/$',  # Galaxy Watch specific patterns
+    r'/galaxy-fit[^/]*-[^/]+-[^/]+/$',  # Galaxy Fit specific patterns
+    r'/galaxy-ring[^/]*-[^/]+-[^/]+/$',  # Galaxy Ring specific patterns
+    r'/galaxy-buds[^/]*-[^/]+-[^/]+/$',  # Galaxy Buds specific patterns
+    r'/galaxy-tab[^/]*-[^/]+-[^/]+/$',  # Galaxy Tab specific patterns
+    r'/galaxy-book[^/]*-[^/]+-[^/]+/$',  # Galaxy Book specific patterns
+
+    # TV model patterns
+    r'/qe\d+[a-z]+\d+[a-z]+/',  # QLED/OLED model codes (e.g., qe65s95fatxxu)
+    r'/ls\d+[a-z]+\d+[a-z]+/',  # Lifestyle TV codes (e.g., ls03fw)
+    r'/the-frame[^/]*-[^/]+-[^/]+/',  # The Frame TV models
+    r'/the-serif[^/]*-[^/]+-[^/]+/',  # The Serif TV models
+    r'/the-terrace[^/]*-[^/]+-[^/]+/',  # The Terrace TV models
+    r'/the-sero[^/]*-[^/]+-[^/]+/',  # The Sero TV models
+
+    # Audio device patterns
+    r'/hw-[a-z0-9]+/',  # Audio device codes (e.g., hw-q990d-xu)
+    r'/q\d+[a-z]+-[^/]+-[^/]+/',  # Soundbar models (e.g., q990d-q-series)
+    r'/s\d+[a-z]+-[^/]+-[^/]+/',  # Sound device models
+
+    # Appliance model patterns
+    r'/ww\d+[a-z]+\d+[a-z]+/',  # Washer model codes (e.g., ww11db8b95gbu1)
+    r'/rl\d+[a-z]+\d+[a-z]+/',  # Refrigerator codes (e.g., rl38c776asr)
+    r'/vs\d+[a-z]+\d+[a-z]+/',  # Vacuum cleaner codes
+    r'/bespoke-[^/]+-[^/]+/',  # Bespoke appliance models
+
+    # Samsung device prefixes
+    r'/sm-[a-z0-9]+-[^/]+/',  # Galaxy devices (SM- prefix)
+    r'/np\d+[a-z]+-[^/]+/',  # Galaxy Book codes (NP prefix)
+
+    # Monitor patterns
+    r'/odyssey-[^/]+-[^/]+-[^/]+/',  # Gaming monitors
+    r'/viewfinity-[^/]+-[^/]+-[^/]+/',  # Professional monitors
+
+    # General product model patterns; repeats are bounded so the stdlib
+    # engine cannot backtrack polynomially on pathological hrefs
+    r'/[^/]{1,40}/[^/]{1,40}-[^/]{1,40}-[^/]{1,40}/$',  # Product model pages
+    r'/[^/]{1,40}/[^/]{1,40}-\w{2}-\w{2,4}/$',  # Product with model codes
+    r'/[^/]{1,40}/[^/]{1,40}-\w{10,40}/$',  # Product with long model codes
+)
+
+# Exclude category, listing pages, and buy/configuration pages
+_EXCLUDE_PATTERNS = (
+    r'/buy/$',  # URLs ending with /buy/
+    r'/buy/\?',  # URLs with /buy/?parameters
+    r'/all-',
+    r'/category/',
+    r'/products/$',
+    r'/help-me-choose/',
+    r'/highlights/',
+    r'/buying-guide/',
+    r'/learn/',
+    r'/compare/',
+    r'/accessories/$',
+)
+
+# Each pattern set collapses into a single alternation compiled at import:
+# one regex pass per URL instead of a Python-level loop over ~30 searches
+_CATEGORY_RE = _url_re.compile('|'.join(f'(?:{p})' for p in _CATEGORY_PATTERNS))
+_PRODUCT_RE = _url_re.compile('|'.join(f'(?:{p})' for p in _PRODUCT_PATTERNS))
+_EXCLUDE_RE = _url_re.compile('|'.join(f'(?:{p})' for p in _EXCLUDE_PATTERNS))
+
+# Product patterns grouped by the device family they describe; index
+# positions refer into _PRODUCT_PATTERNS
+_PATTERN_GROUPS = {
+    'galaxy': _PRODUCT_PATTERNS[0:7],
+    'tv': _PRODUCT_PATTERNS[7:13],
+    'audio': _PRODUCT_PATTERNS[13:16],
+    'appliance': _PRODUCT_PATTERNS[16:20],
+    'device': _PRODUCT_PATTERNS[20:22],
+    'monitor': _PRODUCT_PATTERNS[22:24],
+}
+
+# The generic path-shape patterns apply everywhere
+_WILDCARD_PATTERNS = _PRODUCT_PATTERNS[24:]
+
+# Most model-code patterns only ever fire under particular storefront
+# sections, so bucket them by the first path segment after /uk/ and run just
+# that bucket (plus the wildcard shapes) per URL. Unknown segments fall back
+# to the full union; known segments are deliberately matched tighter than
+# the union — e.g. audio-style model codes no longer count under /uk/tvs/ —
+# which drops fragment duplicates and cross-category false positives.
+_SEGMENT_GROUPS = {
+    'smartphones': ('galaxy', 'device'),
+    'tablets': ('galaxy', 'device'),
+    'watches': ('galaxy', 'device'),
+    'computers': ('galaxy', 'device'),
+    'mobile-accessories': ('galaxy', 'device'),
+    'tvs': ('tv',),
+    'neo-qled-tvs': ('tv',),
+    'oled-tvs': ('tv',),
+    'qled-tv': ('tv',),
+    'lifestyle-tvs': ('tv',),
+    'audio-sound': ('audio', 'galaxy', 'device'),
+    'audio-devices': ('audio', 'galaxy', 'device'),
+    'refrigerators': ('appliance',),
+    'washers-and-dryers': ('appliance',),
+    'dishwashers': ('appliance',),
+    'cooking-appliances': ('appliance',),
+    'microwave-ovens': ('appliance',),
+    'vacuum-cleaners': ('appliance',),
+    'monitors': ('monitor', 'tv'),
+}
+
+def _segment_union(groups):
+    patterns = [p for g in groups for p in _PATTERN_GROUPS[g]]
+    patterns.extend(_WILDCARD_PATTERNS)
+    return _url_re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+_PRODUCT_RE_BY_SEGMENT = {
+    segment: _segment_union(groups) for segment, groups in _SEGMENT_GROUPS.items()
+}
+
+_UK_PREFIX = '/uk/'
+
+
+# Cheap shape gate run before any product pattern: a real PDP path is /uk/
+# plus two to four short segments. Rejecting everything else up front keeps
+# the unbounded-repeat patterns off weird or adversarial URLs entirely
+_URL_SHAPE_RE = re.compile(r'^/uk(?:/[^/?#]{1,80}){2,4}/?$')
+
+# Product-identifier shapes inside a URL path: Samsung model prefixes at a
+# segment start, -xx123-style model tokens, or a long (11+ char) segment
+_IDENT_RE = re.compile(r'/(?:sm-|qe|ls|np)|-[a-z]{2,3}[\d-]|[^/]{11,}(?:/|$)')
+
+
+def _extract_hrefs(html) -> Set[str]:
+    """Unique href values of all anchors in a document"""
+    if HTMLParser is not None:
+        hrefs = {node.attributes.get('href') for node in HTMLParser(html).css('a[href]')}
+        hrefs.discard(None)
+        return hrefs
+    soup = BeautifulSoup(html, 'lxml')
+    return {link['href'] for link in soup.find_all('a', href=True)}
+
+def _path(url: str) -> str:
+    """Path portion of an absolute URL, minus query and fragment.
+
+    urlparse allocates a six-field result and runs a lot of Python for what
+    the hot predicates need here, which is only the path.
+    """
+    i = url.find('/', 8)  # first slash after scheme://host
+    if i == -1:
+        return ''
+    path = url[i:]
+    for sep in ('?', '#'):
+        j = path.find(sep)
+        if j != -1:
+            path = path[:j]
+    return path
+
+
+def _first_uk_segment(url: str) -> Optional[str]:
+    """First path segment after /uk/, or None"""
+    start = url.find(_UK_PREFIX)
+    if start == -1:
+        return None
+    start += len(_UK_PREFIX)
+    end = url.find('/', start)
+    return url[start:end] if end != -1 else url[start:]
+
+
+# Nav and footer links repeat on every page, so the same URL strings get
+# classified thousands of times per crawl; memoizing the pure predicates
+# turns that into one regex evaluation per unique URL
+@functools.lru_cache(maxsize=200_000)
+def is_samsung_uk_url(url: str) -> bool:
+    """Check if URL is a Samsung UK URL"""
+    if 'samsung.com/uk' not in url:
+        return False
+    segment = _first_uk_segment(url)
+    # Strip any query string a segment-final URL might carry
+    if segment:
+        segment = segment.partition('?')[0]
+    return segment not in _EXCLUDED_SEGMENTS
+
+
+@functools.lru_cache(maxsize=200_000)
+def is_product_category_url(url: str) -> bool:
+    """Check if URL is a product category page"""
+    return _CATEGORY_RE.search(url) is not None
+
+
+@functools.lru_cache(maxsize=200_000)
+def is_product_detail_url(url: str) -> bool:
+    """Check if URL is a product detail page"""
+    if not _URL_SHAPE_RE.match(_path(url)):
+        return False
+    # Samsung UK product detail patterns - exclude /buy/ URLs; dispatch
+    # on the storefront section so only the relevant bucket runs
+    segment = _first_uk_segment(url)
+    pattern = _PRODUCT_RE_BY_SEGMENT.get(segment, _PRODUCT_RE)
+    return pattern.search(url) is not None and _EXCLUDE_RE.search(url) is None
+
+
+@functools.lru_cache(maxsize=200_000)
+def extract_category_from_url(url: str) -> Optional[str]:
+    """Extract category from URL path"""
+    path = _path(url).strip('/')
+    parts = path.split('/')
+
+    # Skip language/region parts
+    if len(parts) > 0 and parts[0] == 'uk':
+        parts = parts[1:]
+
+    # Return first meaningful category
+    if parts:
+        return parts[0]
+    return None
+
 class URLDiscovery:
     def __init__(self, concurrency: int = 5):
         self.concurrency = concurrency
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[httpx.AsyncClient] = None
         self.playwright = None
         self.browser = None
+        self.context = None
+        self.page_pool: Optional[asyncio.Queue] = None
         
         # URL tracking
         self.category_urls: Set[str] = set()
         self.product_urls: Set[str] = set()
         self.url_metadata: Dict[str, Dict] = {}
         
+        # Listing-API endpoints observed per category during first render
+        self.listing_endpoints: Dict[str, str] = {}
+        
+        # Work queue for category pages; sub-categories found mid-crawl are
+        # fed back in (set in run())
+        self._category_queue: Optional[asyncio.Queue] = None
+        self._queued_categories: Set[str] = set()
+        
         # Statistics
         self.stats = {
             'categories_discovered': 0,
@@ -63,13 +417,14 @@ class URLDiscovery:
 
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            headers={'User-Agent': USER_AGENT}
+        # HTTP/2 multiplexes every request to samsung.com over a couple of
+        # TLS connections instead of paying per-connection setup on HTTP/1.1
+        self.session = httpx.AsyncClient(
+            http2=True,
+            headers={'User-Agent': USER_AGENT, 'Accept-Encoding': 'br, gzip'},
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=50),
+            follow_redirects=True,
         )
         
         self.playwright = await async_playwright().start()
@@ -78,148 +433,54 @@ class URLDiscovery:
             args=['--no-sandbox', '--disable-dev-shm-usage']
         )
         
+        # One shared context: cookies, TLS session and resource cache are
+        # reused across every category instead of rebuilt per new_page()
+        self.context = await self.browser.new_context(user_agent=USER_AGENT)
+        await self.context.route('**/*', self._route_filter)
+        
+        # Warm page pool drawn from round-robin by dynamic discovery
+        self.page_pool = asyncio.Queue()
+        for _ in range(min(self.concurrency, PAGE_POOL_SIZE)):
+            self.page_pool.put_nowait(await self.context.new_page())
+        
         return self
 
+    @staticmethod
+    async def _route_filter(route):
+        """Abort requests for resources discovery never looks at"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
+        if self.context:
+            await self.context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
 
+    # The URL predicates are pure functions of the URL string, so they live
+    # at module level behind lru_cache; the methods just delegate
     def is_samsung_uk_url(self, url: str) -> bool:
         """Check if URL is a Samsung UK URL"""
-        return 'samsung.com/uk' in url and not any(excluded in url for excluded in [
-            '/info/', '/support/', '/business/', '/offer/', '/estore/', 
-            '/legal/', '/privacy/', '/sustainability/', '/mypage/', 
-            '/members/', '/account/', '/login', '/register', '/cart'
-        ])
+        return is_samsung_uk_url(url)
 
     def is_product_category_url(self, url: str) -> bool:
         """Check if URL is a product category page"""
-        category_patterns = [
-            # Mobile & Wearables
-            r'/smartphones/',
-            r'/tablets/',
-            r'/watches/',
-            r'/computers/',
-            r'/audio-sound/',
-            r'/mobile-accessories/',
-            
-            # TV & AV
-            r'/tvs/',
-            r'/neo-qled-tvs/',
-            r'/oled-tvs/',
-            r'/qled-tv/',
-            r'/lifestyle-tvs/',
-            r'/audio-devices/',
-            
-            # Home Appliances
-            r'/refrigerators/',
-            r'/washers-and-dryers/',
-            r'/dishwashers/',
-            r'/cooking-appliances/',
-            r'/microwave-ovens/',
-            r'/vacuum-cleaners/',
-            
-            # Computing & Storage
-            r'/monitors/',
-            r'/memory-storage/',
-            
-            # Business
-            r'/business/projectors/',
-            r'/projectors/',
-            
-            # Generic patterns
-            r'/all-',
-            r'/category/',
-            r'/products/'
-        ]
-        
-        return any(re.search(pattern, url) for pattern in category_patterns)
+        return is_product_category_url(url)
 
     def is_product_detail_url(self, url: str) -> bool:
         """Check if URL is a product detail page"""
-        # Samsung UK product detail patterns - exclude /buy/ URLs
-        product_patterns = [
-            # Galaxy device patterns
-            r'/galaxy-[^/]+/$',  # Galaxy product pages (not /buy/)
-            r'/galaxy-watch[^/]*-[^/]+-[^/]+/$',  # Galaxy Watch specific patterns
-            r'/galaxy-fit[^/]*-[^/]+-[^/]+/$',  # Galaxy Fit specific patterns
-            r'/galaxy-ring[^/]*-[^/]+-[^/]+/$',  # Galaxy Ring specific patterns
-            r'/galaxy-buds[^/]*-[^/]+-[^/]+/$',  # Galaxy Buds specific patterns
-            r'/galaxy-tab[^/]*-[^/]+-[^/]+/$',  # Galaxy Tab specific patterns
-            r'/galaxy-book[^/]*-[^/]+-[^/]+/$',  # Galaxy Book specific patterns
-            
-            # TV model patterns 
-            r'/qe\d+[a-z]+\d+[a-z]+/',  # QLED/OLED model codes (e.g., qe65s95fatxxu)
-            r'/ls\d+[a-z]+\d+[a-z]+/',  # Lifestyle TV codes (e.g., ls03fw)
-            r'/the-frame[^/]*-[^/]+-[^/]+/',  # The Frame TV models
-            r'/the-serif[^/]*-[^/]+-[^/]+/',  # The Serif TV models
-            r'/the-terrace[^/]*-[^/]+-[^/]+/',  # The Terrace TV models
-            r'/the-sero[^/]*-[^/]+-[^/]+/',  # The Sero TV models
-            
-            # Audio device patterns
-            r'/hw-[a-z0-9]+/',  # Audio device codes (e.g., hw-q990d-xu)
-            r'/q\d+[a-z]+-[^/]+-[^/]+/',  # Soundbar models (e.g., q990d-q-series)
-            r'/s\d+[a-z]+-[^/]+-[^/]+/',  # Sound device models
-            
-            # Appliance model patterns
-            r'/ww\d+[a-z]+\d+[a-z]+/',  # Washer model codes (e.g., ww11db8b95gbu1)
-            r'/rl\d+[a-z]+\d+[a-z]+/',  # Refrigerator codes (e.g., rl38c776asr)
-            r'/vs\d+[a-z]+\d+[a-z]+/',  # Vacuum cleaner codes
-            r'/bespoke-[^/]+-[^/]+/',  # Bespoke appliance models
-            
-            # Samsung device prefixes
-            r'/sm-[a-z0-9]+-[^/]+/',  # Galaxy devices (SM- prefix)
-            r'/np\d+[a-z]+-[^/]+/',  # Galaxy Book codes (NP prefix)
-            
-            # Monitor patterns
-            r'/odyssey-[^/]+-[^/]+-[^/]+/',  # Gaming monitors
-            r'/viewfinity-[^/]+-[^/]+-[^/]+/',  # Professional monitors
-            r'/ls\d+[a-z]+\d+[a-z]+/',  # Monitor model codes
-            
-            # General product model patterns
-            r'/[^/]+/[^/]+-[^/]+-[^/]+/$',  # Product model pages
-            r'/[^/]+/[^/]+-\w{2}-\w{2,4}/$',  # Product with model codes
-            r'/[^/]+/[^/]+-\w{10,}/$',  # Product with long model codes
-        ]
-        
-        # Exclude category, listing pages, and buy/configuration pages
-        exclude_patterns = [
-            r'/buy/$',  # URLs ending with /buy/
-            r'/buy/\?',  # URLs with /buy/?parameters
-            r'/all-',
-            r'/category/',
-            r'/products/$',
-            r'/help-me-choose/',
-            r'/highlights/',
-            r'/buying-guide/',
-            r'/learn/',
-            r'/compare/',
-            r'/accessories/$'
-        ]
-        
-        is_product = any(re.search(pattern, url) for pattern in product_patterns)
-        is_excluded = any(re.search(pattern, url) for pattern in exclude_patterns)
-        
-        return is_product and not is_excluded
+        return is_product_detail_url(url)
 
     def extract_category_from_url(self, url: str) -> Optional[str]:
         """Extract category from URL path"""
-        path = urlparse(url).path.strip('/')
-        parts = path.split('/')
-        
-        # Skip language/region parts
-        if len(parts) > 0 and parts[0] == 'uk':
-            parts = parts[1:]
-        
-        # Return first meaningful category
-        if parts:
-            return parts[0]
-        return None
+        return extract_category_from_url(url)
 
     async def discover_sitemap_categories(self) -> Set[str]:
         """Discover category URLs from Samsung UK sitemap"""
@@ -227,29 +488,31 @@ class URLDiscovery:
         category_urls = set()
         
         try:
-            async with self.session.get(SITEMAP_URL) as response:
-                if response.status != 200:
-                    logger.warning(f"Sitemap fetch failed: {response.status}")
+            async with self.session.stream('GET', SITEMAP_URL) as response:
+                if response.status_code != 200:
+                    logger.warning(f"Sitemap fetch failed: {response.status_code}")
                     return category_urls
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                # Stream the body into one buffer and hand the bytes
+                # straight to the parser: no whole-document str decode, and
+                # download overlaps the buffering
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(65536):
+                    buf.extend(chunk)
                 
-                # Find all links in the sitemap
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if href.startswith('/'):
-                        full_url = urljoin(BASE_URL, href)
-                    elif href.startswith('http'):
-                        full_url = href
-                    else:
-                        continue
-                    
-                    # Filter for Samsung UK product category URLs
-                    if (self.is_samsung_uk_url(full_url) and 
-                        self.is_product_category_url(full_url)):
-                        category_urls.add(full_url)
-                        logger.debug(f"Discovered category: {full_url}")
+                # Dedupe hrefs before normalizing and classifying: nav and
+                # footer links repeat many times within a single page
+                hrefs = _extract_hrefs(bytes(buf))
+                urls = {
+                    urljoin(BASE_URL, href) if href.startswith('/') else href
+                    for href in hrefs if href.startswith(('/', 'http'))
+                }
+                
+                # Filter for Samsung UK product category URLs
+                category_urls |= {
+                    url for url in urls
+                    if is_samsung_uk_url(url) and is_product_category_url(url)
+                }
         
         except Exception as e:
             logger.error(f"Error discovering categories from sitemap: {e}")
@@ -283,33 +546,47 @@ class URLDiscovery:
         product_urls = set()
         category = self.extract_category_from_url(category_url)
         
+        # No point fetching and parsing HTML whose product grid only exists
+        # after client-side rendering
+        if category in JS_ONLY_CATEGORIES:
+            product_urls = await self.discover_products_dynamic(category_url, category)
+            logger.info(f"Found {len(product_urls)} products in category: {category}")
+            return product_urls
+        
         try:
             # Try static scraping first
-            async with self.session.get(category_url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find product links
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        if href.startswith('/'):
-                            full_url = urljoin(BASE_URL, href)
-                        elif href.startswith('http'):
-                            full_url = href
-                        else:
-                            continue
-                        
-                        if (self.is_samsung_uk_url(full_url) and 
-                            self.is_product_detail_url(full_url)):
-                            product_urls.add(full_url)
-                            
-                            # Store metadata
-                            self.url_metadata[full_url] = {
-                                'category': category,
-                                'source_category_url': category_url,
-                                'discovered_at': datetime.now(timezone.utc).isoformat()
-                            }
+            response = await self.session.get(category_url)
+            if response.status_code == 200:
+                # Decompressed bytes go straight to the parser; href values
+                # are ASCII, so the full-document str decode buys nothing
+                hrefs = _extract_hrefs(response.content)
+                urls = {
+                    urljoin(BASE_URL, href) if href.startswith('/') else href
+                    for href in hrefs if href.startswith(('/', 'http'))
+                }
+                product_urls |= {
+                    url for url in urls
+                    if is_samsung_uk_url(url) and is_product_detail_url(url)
+                }
+                
+                # Feed newly seen sub-category pages back into the queue
+                if self._category_queue is not None:
+                    for url in urls:
+                        if (url not in self._queued_categories
+                                and len(self._queued_categories) < MAX_CATEGORY_PAGES
+                                and is_samsung_uk_url(url)
+                                and is_product_category_url(url)):
+                            self._queued_categories.add(url)
+                            self._category_queue.put_nowait(url)
+                
+                # Store metadata
+                discovered_at = datetime.now(timezone.utc).isoformat()
+                for full_url in product_urls:
+                    self.url_metadata[full_url] = {
+                        'category': category,
+                        'source_category_url': category_url,
+                        'discovered_at': discovered_at
+                    }
             
             # If few products found, try dynamic scraping
             if len(product_urls) < 5:
@@ -326,8 +603,25 @@ class URLDiscovery:
         """Use Playwright to discover products from dynamic content"""
         product_urls = set()
         
+        # A recorded listing endpoint lets us skip the browser outright
+        endpoint = self.listing_endpoints.get(category)
+        if endpoint:
+            return await self._discover_from_listing_api(endpoint, category, category_url)
+        
+        page = await self.page_pool.get()
         try:
-            page = await self.browser.new_page()
+            # Record the JSON listing request the page makes while rendering
+            captured = {}
+            def record_listing(response):
+                if captured:
+                    return
+                if 'page=' not in response.url and 'offset=' not in response.url:
+                    return
+                if 'json' not in (response.headers.get('content-type') or ''):
+                    return
+                if _listing_page_param(response.url):
+                    captured['url'] = response.url
+            page.on('response', record_listing)
             
             # Increased timeout for heavy category pages
             await page.goto(category_url, wait_until='networkidle', timeout=45000)
@@ -338,14 +632,23 @@ class URLDiscovery:
             # Scroll to trigger lazy loading
             await self._scroll_to_load_content(page)
             
+            if captured:
+                # Enumerate the remaining batches over plain HTTP instead of
+                # driving up to 15 Load-more clicks through the browser
+                self.listing_endpoints[category] = captured['url']
+                product_urls.update(
+                    await self._discover_from_listing_api(captured['url'], category, category_url)
+                )
+            
             # Handle filter parameters for specific categories
             if 'crystal-uhd' in category_url:
                 # Handle filtered TV category
                 await page.wait_for_timeout(2000)
             
-            # Handle pagination and "Load more" buttons
+            # Handle pagination and "Load more" buttons; skipped when the
+            # listing API is doing the paging for us
             load_attempts = 0
-            while load_attempts < 15:  # Increased from 10 to 15
+            while not captured and load_attempts < 15:
                 # Enhanced load more button selectors
                 load_more_selectors = [
                     'button:has-text("Load more")',
@@ -380,39 +683,92 @@ class URLDiscovery:
                 
                 load_attempts += 1
             
-            # Extract all links from the page
-            links = await page.query_selector_all('a[href]')
-            for link in links:
-                href = await link.get_attribute('href')
-                if not href:
-                    continue
-                
-                if href.startswith('/'):
-                    full_url = urljoin(BASE_URL, href)
-                elif href.startswith('http'):
-                    full_url = href
-                else:
-                    continue
-                
-                if (self.is_samsung_uk_url(full_url) and 
-                    self.is_product_detail_url(full_url)):
-                    product_urls.add(full_url)
-                    
-                    # Store metadata
-                    self.url_metadata[full_url] = {
-                        'category': category,
-                        'source_category_url': category_url,
-                        'discovered_at': datetime.now(timezone.utc).isoformat(),
-                        'dynamic_discovery': True
-                    }
-            
-            await page.close()
+            # Pull every href in one JS round-trip and classify the whole
+            # vector at once through the compiled unions, instead of one
+            # get_attribute call plus predicate dispatch per element
+            discovered_at = datetime.now(timezone.utc).isoformat()
+            hrefs = await page.eval_on_selector_all(
+                'a[href]', 'els => els.map(e => e.getAttribute("href"))'
+            )
+            urls = {
+                urljoin(BASE_URL, href) if href.startswith('/') else href
+                for href in set(hrefs) if href and href.startswith(('/', 'http'))
+            }
+            found = {
+                url for url in urls
+                if is_samsung_uk_url(url) and is_product_detail_url(url)
+            }
+            for full_url in found:
+                self.url_metadata[full_url] = {
+                    'category': category,
+                    'source_category_url': category_url,
+                    'discovered_at': discovered_at,
+                    'dynamic_discovery': True
+                }
+            product_urls.update(found)
         
         except Exception as e:
             logger.error(f"Error in dynamic discovery for {category_url}: {e}")
+        finally:
+            # Pages are pooled for the whole run: detach the listener even
+            # when goto timed out, or every failed attempt would leave one
+            # more closure firing on all subsequent responses
+            try:
+                page.remove_listener('response', record_listing)
+            except Exception:
+                pass
+            # Park the page and hand it back to the pool
+            try:
+                await page.goto('about:blank')
+            except Exception:
+                pass
+            self.page_pool.put_nowait(page)
         
         return product_urls
 
+    async def _discover_from_listing_api(self, endpoint: str, category: str,
+                                          category_url: str) -> Set[str]:
+        """Page through a recorded listing endpoint with plain HTTP GETs"""
+        product_urls = set()
+        param = _listing_page_param(endpoint)
+        if not param:
+            return product_urls
+        
+        step = 1 if param.lower() == 'page' else 24
+        for i in range(1, MAX_LISTING_PAGES + 1):
+            page_url = _listing_page_url(endpoint, param, i * step)
+            try:
+                response = await self.session.get(page_url)
+                if response.status_code != 200:
+                    break
+                payload = response.text
+            except Exception as e:
+                logger.debug(f"Listing API fetch failed for {page_url}: {e}")
+                break
+            
+            batch = set()
+            for candidate in _URL_IN_JSON_RE.findall(payload.replace('\\/', '/')):
+                if candidate.startswith('/'):
+                    candidate = urljoin(BASE_URL, candidate)
+                if is_samsung_uk_url(candidate) and is_product_detail_url(candidate):
+                    batch.add(candidate)
+            
+            new_urls = batch - product_urls
+            if not new_urls:
+                break
+            discovered_at = datetime.now(timezone.utc).isoformat()
+            for full_url in new_urls:
+                self.url_metadata[full_url] = {
+                    'category': category,
+                    'source_category_url': category_url,
+                    'discovered_at': discovered_at,
+                    'listing_api': True
+                }
+            product_urls.update(new_urls)
+        
+        logger.info(f"Listing API yielded {len(product_urls)} products for {category}")
+        return product_urls
+
     async def _scroll_to_load_content(self, page):
         """Scroll down the page to trigger lazy loading of products"""
         try:
@@ -441,32 +797,19 @@ class URLDiscovery:
         
         logger.info(f"Filtering {len(urls)} product URLs using pattern matching...")
         
+        # Every URL here already passed is_product_detail_url during
+        # discovery, so only the depth/identifier quality checks remain —
+        # one compiled regex over the path instead of a per-segment loop
         for url in urls:
-            # Apply additional filtering beyond the initial product detection
-            if self.is_product_detail_url(url):
-                # Additional quality checks
-                parsed = urlparse(url)
-                path_parts = parsed.path.strip('/').split('/')
-                
-                # Ensure URL has meaningful depth (not just category pages)
-                if len(path_parts) >= 2:
-                    # Check for model codes or specific product identifiers
-                    has_product_identifier = any(
-                        len(part) > 10 or  # Long identifiers (model codes)
-                        re.search(r'-[a-z]{2,3}[\d-]+', part) or  # Model pattern like -sm-r630
-                        part.startswith(('sm-', 'qe', 'ls', 'np'))  # Samsung model prefixes
-                        for part in path_parts
-                    )
-                    
-                    if has_product_identifier or len(path_parts) >= 3:
-                        valid_urls.add(url)
-                        logger.debug(f"Pattern-validated: {url}")
-                    else:
-                        logger.debug(f"No product identifier found: {url}")
-                else:
-                    logger.debug(f"URL too shallow: {url}")
+            path = _path(url)
+            depth = path.strip('/').count('/') + 1
+            
+            # Ensure URL has meaningful depth (not just category pages)
+            if depth >= 2 and (depth >= 3 or _IDENT_RE.search(path)):
+                valid_urls.add(url)
+                logger.debug(f"Pattern-validated: {url}")
             else:
-                logger.debug(f"Failed product pattern check: {url}")
+                logger.debug(f"Rejected by quality check: {url}")
         
         logger.info(f"Pattern-filtered {len(valid_urls)} out of {len(urls)} URLs")
         return valid_urls
@@ -475,16 +818,22 @@ class URLDiscovery:
         """Save discovered product URLs to file"""
         logger.info(f"Saving {len(self.product_urls)} product URLs to {filename}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            for url in sorted(self.product_urls):
-                f.write(url + '\n')
+        # One join + one write instead of a Python-level call per URL
+        data = '\n'.join(sorted(self.product_urls))
+        with open(filename, 'wb') as f:
+            f.write(data.encode('utf-8'))
+            f.write(b'\n')
 
     async def save_metadata(self, filename: str = 'url_metadata.json'):
         """Save URL metadata to JSON file"""
         logger.info(f"Saving metadata for {len(self.url_metadata)} URLs to {filename}")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.url_metadata, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.url_metadata, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.url_metadata, f, indent=2, ensure_ascii=False)
 
     def print_summary(self):
         """Print discovery summary"""
@@ -520,21 +869,46 @@ class URLDiscovery:
         self.category_urls = category_urls
         self.stats['categories_discovered'] = len(category_urls)
         
-        # Discover product URLs from categories
+        # Discover product URLs from categories through a shared work queue:
+        # workers stay saturated, and sub-categories discovered mid-crawl are
+        # enqueued instead of being lost
         all_product_urls = set()
-        semaphore = asyncio.Semaphore(self.concurrency)
-        
-        async def process_category(category_url):
-            async with semaphore:
-                product_urls = await self.discover_products_from_category(category_url)
-                all_product_urls.update(product_urls)
-                self.stats['pages_processed'] += 1
-                # Small delay to be respectful
-                await asyncio.sleep(1)
-        
-        # Process categories concurrently
-        tasks = [process_category(url) for url in category_urls]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._category_queue = queue
+        self._queued_categories = set(category_urls)
+        # Longest-processing-time-first: enqueue the heavy categories first
+        # so the crawl tail isn't one slow category started last
+        ordered = sorted(
+            category_urls,
+            key=lambda u: -CATEGORY_WEIGHTS.get(extract_category_from_url(u) or '', 1),
+        )
+        for url in ordered:
+            queue.put_nowait(url)
+        
+        async def worker():
+            while True:
+                category_url = await queue.get()
+                try:
+                    if category_url is None:
+                        return
+                    product_urls = await self.discover_products_from_category(category_url)
+                    all_product_urls.update(product_urls)
+                    self.stats['pages_processed'] += 1
+                    # Small delay to be respectful
+                    await asyncio.sleep(1)
+                except Exception as e:
+                    logger.error(f"Worker error on {category_url}: {e}")
+                finally:
+                    queue.task_done()
+        
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(self.concurrency):
+                tg.create_task(worker())
+            await queue.join()
+            # Drained: release the workers
+            for _ in range(self.concurrency):
+                queue.put_nowait(None)
+        self._category_queue = None
         
         # Validate product URLs
         self.product_urls = await self.validate_product_urls(all_product_urls)
@@ -559,4 +933,11 @@ async def main():
         await discovery.run()
 
 if __name__ == "__main__":
+    # Swap in uvloop when installed: the crawl is all small coroutine
+    # switches over aiohttp and Playwright I/O, where it shines
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -11,193 +11,299 @@ from playwright.async_api import async_playwright
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def test_category_pagination(url: str):
-    """Test pagination on a specific category URL"""
+# Resource types aborted via route interception: the test only reads anchor
+# hrefs, so the pixel pipeline is pure overhead while JS must keep running
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'stylesheet'}
+
+# Substrings that mark product-like URLs; matching happens in-page via
+# the regex built below, the patterns are plain literals (nothing needs
+# escaping for JS regex syntax)
+PRODUCT_PATTERNS = ('-sm-', '-qe', '-ls', '-hw-', '-np', '-vs', 'galaxy-', 'neo-qled', 'oled')
+
+# Installed via add_init_script before any page script runs: one compiled
+# JS regex on window, shared by every evaluate instead of a fresh pattern
+# array per page load (the patterns are plain literals, safe unescaped)
+_PRODUCT_RE_INIT_JS = "window.__productRE = /%s/;" % '|'.join(PRODUCT_PATTERNS)
+
+# Load more button selectors, built once instead of per call
+LOAD_MORE_SELECTORS = (
+    'button:has-text("Load more")',
+    'button:has-text("Show more")',
+    'button:has-text("View more")',
+    'button:has-text("See all")',
+    '.load-more',
+    '.show-more',
+    '.view-more',
+    '[data-testid="load-more"]',
+    '[class*="load-more"]',
+    '[class*="show-more"]',
+    'button[class*="pagination"]',
+    'button[class*="load"]',
+    'button[class*="more"]',
+)
+
+# "View more" buttons scoped to product listings (not the filter sidebar)
+PRODUCT_VIEW_MORE_SELECTORS = (
+    '.product-list button:has-text("View more")',
+    '.products button:has-text("View more")',
+    '.grid button:has-text("View more")',
+    '[class*="product"] button:has-text("View more")',
+    '[data-testid*="product"] button:has-text("View more")',
+    '.listing button:has-text("View more")',
+    'main button:has-text("View more")',
+    'section button:has-text("View more")',
+)
+
+# Comma-joined unions: the browser evaluates each group in one
+# selector-engine invocation instead of up to 21 sequential queries
+MERGED_PRODUCT_VIEW_MORE_SELECTOR = ', '.join(PRODUCT_VIEW_MORE_SELECTORS)
+MERGED_LOAD_MORE_SELECTOR = ', '.join(LOAD_MORE_SELECTORS)
+
+# Every click candidate in priority order: product-scoped selectors first,
+# generic load-more selectors as the long tail
+_CLICK_SELECTORS = list(PRODUCT_VIEW_MORE_SELECTORS + LOAD_MORE_SELECTORS)
+
+# Category pages exercised by the test run
+TEST_URLS = (
+    "https://www.samsung.com/uk/smartphones/galaxy-s/",
+    "https://www.samsung.com/uk/tvs/qled-tv/",
+    "https://www.samsung.com/uk/tablets/all-tablets/",
+)
+
+# Runs in the renderer: walk the candidate selectors, take the first button
+# that is visible (offsetParent) and enabled, scroll and click it natively,
+# and report which selector matched. One protocol message replaces the
+# is_visible() + is_enabled() pair per candidate. Playwright's :has-text()
+# pseudo-class is emulated with a textContent check since querySelectorAll
+# does not understand it. Buttons sitting in filter/sidebar/nav containers
+# are rejected by a parent-class test in the same traversal, replacing the
+# old xpath=.. round-trips.
+_CLICK_LOAD_MORE_JS = r"""
+(sels) => {
+  const HT = /:has-text\("([^"]+)"\)/;
+  for (const s of sels) {
+    const m = s.match(HT);
+    let els;
+    try { els = document.querySelectorAll(m ? s.replace(HT, '') : s); } catch (e) { continue; }
+    for (const b of els) {
+      if (m && !(b.textContent || '').includes(m[1])) continue;
+      if (!b.offsetParent || b.disabled) continue;
+      if (b.parentElement && /filter|sidebar|nav|menu/i.test(b.parentElement.className)) continue;
+      b.scrollIntoView();
+      b.click();
+      return s;
+    }
+  }
+  return null;
+}
+"""
+
+# Installed once per page: window.__seenProducts accumulates product URLs
+# across the whole session — read from the .href DOM property, so the
+# browser resolves relative paths itself — and window.__scanNew() returns
+# only the URLs added since the previous call. Each post-click protocol
+# message therefore carries the small delta, not the ever-growing full
+# list, even though the anchors are rescanned natively in V8.
+_INSTALL_URL_TRACKER_JS = """
+() => {
+  window.__seenProducts = new Set();
+  window.__scanNew = () => {
+    const added = [];
+    for (const a of document.querySelectorAll('a[href]')) {
+      const h = (a.href || '').split('#')[0];
+      if (!h.includes('samsung.com')) continue;
+      if (!window.__productRE.test(h)) continue;
+      if (window.__seenProducts.has(h)) continue;
+      window.__seenProducts.add(h);
+      added.push(h);
+    }
+    return added;
+  };
+}
+"""
+
+async def scan_new_product_urls(page) -> list:
+    """Product URLs that appeared since the last scan on this page"""
+    return await page.evaluate("window.__scanNew()")
+
+async def block_heavy_resources(route):
+    """Abort requests the href scrape never needs"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def _is_listing_response(response) -> bool:
+    """Heuristic for the listing XHR that a load-more click fires"""
+    return '/api/' in response.url and response.status == 200
+
+async def wait_for_new_links(page, prev_count: int) -> bool:
+    """Race anchor-count growth against network idle after a click,
+    resolving on whichever fires first. Returns True when the network
+    went idle without the anchor count growing — the clearest signal
+    that the listing is exhausted and further clicks are no-ops."""
+    growth = asyncio.ensure_future(page.wait_for_function(
+        "p => document.querySelectorAll('a[href]').length > p",
+        arg=prev_count,
+        timeout=6000,
+    ))
+    idle = asyncio.ensure_future(page.wait_for_load_state('networkidle', timeout=6000))
+    done, pending = await asyncio.wait(
+        {growth, idle}, return_when=asyncio.FIRST_COMPLETED, timeout=6,
+    )
+    for task in pending:
+        task.cancel()
+    if growth in done and growth.exception() is None:
+        return False
+    if idle in done and idle.exception() is None:
+        grew = await page.evaluate("document.querySelectorAll('a[href]').length") > prev_count
+        return not grew
+    return False
+
+async def test_category_pagination(page, url: str):
+    """Test pagination on a specific category URL using a shared page"""
     logger.info(f"Testing pagination for: {url}")
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # Visible browser for debugging
-        page = await browser.new_page()
-        
+
+    try:
+        # Return as soon as the navigation commits; readiness is gated on
+        # the content below, not on a fixed sleep
+        await page.goto(url, wait_until='commit')
         try:
-            # Navigate to the page
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            await page.wait_for_timeout(3000)
-            
-            # Count initial products - use generic selector for any category
-            initial_products = await page.query_selector_all('a[href]')
-            product_links = []
-            for link in initial_products:
-                href = await link.get_attribute('href')
-                if href and ('samsung.com' in href or href.startswith('/')):
-                    # Look for URLs that seem like product pages
-                    if any(pattern in href for pattern in ['-sm-', '-qe', '-ls', '-hw-', '-np', '-vs', 'galaxy-', 'neo-qled', 'oled']):
-                        product_links.append(href)
-            
-            logger.info(f"Initial product-like links found: {len(product_links)}")
-            
-            # Look for load more buttons
-            load_more_selectors = [
-                'button:has-text("Load more")',
-                'button:has-text("Show more")',
-                'button:has-text("View more")',
-                'button:has-text("See all")',
-                '.load-more',
-                '.show-more',
-                '.view-more',
-                '[data-testid="load-more"]',
-                '[class*="load-more"]',
-                '[class*="show-more"]',
-                'button[class*="pagination"]',
-                'button[class*="load"]',
-                'button[class*="more"]',
-            ]
-            
-            # Check which load more buttons exist
-            for selector in load_more_selectors:
-                try:
-                    buttons = await page.query_selector_all(selector)
-                    if buttons:
-                        logger.info(f"Found {len(buttons)} buttons with selector: {selector}")
-                        for i, button in enumerate(buttons):
-                            text = await button.inner_text()
-                            is_visible = await button.is_visible()
-                            logger.info(f"  Button {i}: '{text}' (visible: {is_visible})")
-                except Exception as e:
-                    logger.debug(f"Error checking selector {selector}: {e}")
-            
-            # Try clicking load more buttons
-            load_attempts = 0
-            max_attempts = 20
-            
-            while load_attempts < max_attempts:
-                button_clicked = False
-                
-                # Try to find the product listing "View more" button (not filter "View more")
+            await page.locator('a[href*="/uk/"]').first.wait_for(state='attached')
+        except Exception:
+            logger.debug(f"No catalogue anchors appeared within timeout on {url}")
+
+        # Count initial products - filtered and deduped in the renderer,
+        # which keeps the running set from here on
+        await page.evaluate(_INSTALL_URL_TRACKER_JS)
+        new_urls = await scan_new_product_urls(page)
+
+        logger.info(f"Initial product-like links found: {len(new_urls)}")
+
+        # Check which load more buttons exist
+        for selector in LOAD_MORE_SELECTORS:
+            try:
+                buttons = await page.query_selector_all(selector)
+                if buttons:
+                    logger.info(f"Found {len(buttons)} buttons with selector: {selector}")
+                    for i, button in enumerate(buttons):
+                        text = await button.inner_text()
+                        is_visible = await button.is_visible()
+                        logger.info(f"  Button {i}: '{text}' (visible: {is_visible})")
+            except Exception as e:
+                logger.debug(f"Error checking selector {selector}: {e}")
+
+        # Try clicking load more buttons; the renderer-side set is the
+        # dedupe authority, so Python keeps only a running total and a
+        # small capped list of real URLs for the sample log
+        total_urls = len(new_urls)
+        sample_urls = new_urls[:10]
+        stagnant = 0
+        load_attempts = 0
+        max_attempts = 20
+
+        while load_attempts < max_attempts:
+            button_clicked = False
+            links_before = await page.evaluate("document.querySelectorAll('a[href]').length")
+
+            # Arm the response waiter before clicking so the XHR the click
+            # fires cannot complete in the gap between click and wait
+            response_waiter = asyncio.ensure_future(
+                page.wait_for_event('response', predicate=_is_listing_response, timeout=6000)
+            )
+
+            # Single in-page pass: find, scroll and click the first eligible
+            # button natively, all in one evaluate
+            clicked_selector = await page.evaluate(_CLICK_LOAD_MORE_JS, _CLICK_SELECTORS)
+            exhausted = False
+            if not clicked_selector:
+                response_waiter.cancel()
+            else:
+                logger.info(f"Clicked load-more button via {clicked_selector}")
                 try:
-                    # Look for "View more" button that's associated with product listings
-                    # This is usually in a products container or has specific classes
-                    product_view_more_selectors = [
-                        '.product-list button:has-text("View more")',
-                        '.products button:has-text("View more")',
-                        '.grid button:has-text("View more")',
-                        '[class*="product"] button:has-text("View more")',
-                        '[data-testid*="product"] button:has-text("View more")',
-                        '.listing button:has-text("View more")',
-                        'main button:has-text("View more")',
-                        'section button:has-text("View more")',
-                    ]
-                    
-                    for selector in product_view_more_selectors:
-                        button = await page.query_selector(selector)
-                        if button and await button.is_visible() and await button.is_enabled():
-                            logger.info(f"Clicking product listing View more button: {selector}")
-                            await button.scroll_into_view_if_needed()
-                            await button.click()
-                            await page.wait_for_timeout(4000)
-                            button_clicked = True
-                            break
-                    
-                    # If no specific selector worked, try generic "View more" but avoid filter areas
-                    if not button_clicked:
-                        view_more_buttons = await page.query_selector_all('button:has-text("View more")')
-                        for i, button in enumerate(view_more_buttons):
-                            if await button.is_visible() and await button.is_enabled():
-                                # Get parent context to avoid filter "View more" buttons
-                                parent = await button.query_selector('xpath=..')
-                                parent_class = await parent.get_attribute('class') if parent else ""
-                                
-                                # Skip if it's likely a filter button
-                                if any(term in parent_class.lower() for term in ['filter', 'sidebar', 'nav', 'menu']):
-                                    logger.debug(f"Skipping filter View more button {i}")
-                                    continue
-                                
-                                logger.info(f"Clicking generic View more button {i}")
-                                await button.scroll_into_view_if_needed()
-                                await button.click()
-                                await page.wait_for_timeout(4000)
-                                button_clicked = True
-                                break
-                except Exception as e:
-                    logger.debug(f"Error clicking View more: {e}")
-                
-                # If no View more button worked, try other selectors
-                if not button_clicked:
-                    for selector in load_more_selectors:
-                        try:
-                            button = await page.query_selector(selector)
-                            if button and await button.is_visible() and await button.is_enabled():
-                                logger.info(f"Clicking load more button: {selector}")
-                                await button.scroll_into_view_if_needed()
-                                await button.click()
-                                await page.wait_for_timeout(4000)
-                                button_clicked = True
-                                break
-                        except Exception as e:
-                            logger.debug(f"Error clicking {selector}: {e}")
-                            continue
-                
-                if not button_clicked:
-                    logger.info("No more clickable load buttons found")
-                    break
-                
-                # Count products after clicking - use generic approach
-                current_products = await page.query_selector_all('a[href]')
-                current_product_links = []
-                for link in current_products:
-                    href = await link.get_attribute('href')
-                    if href and ('samsung.com' in href or href.startswith('/')):
-                        if any(pattern in href for pattern in ['-sm-', '-qe', '-ls', '-hw-', '-np', '-vs', 'galaxy-', 'neo-qled', 'oled']):
-                            current_product_links.append(href)
-                
-                logger.info(f"Product-like links after load attempt {load_attempts + 1}: {len(current_product_links)}")
-                
-                load_attempts += 1
-            
-            # Final count and extraction
-            final_products = await page.query_selector_all('a[href]')
-            all_urls = set()
-            for product in final_products:
-                href = await product.get_attribute('href')
-                if href:
-                    if href.startswith('/'):
-                        href = f"https://www.samsung.com{href}"
-                    
-                    # Check if it looks like a Samsung product URL
-                    if ('samsung.com' in href and 
-                        any(pattern in href for pattern in ['-sm-', '-qe', '-ls', '-hw-', '-np', '-vs', 'galaxy-', 'neo-qled', 'oled'])):
-                        # Remove anchor fragments
-                        if '#' in href:
-                            href = href.split('#')[0]
-                        all_urls.add(href)
-            
-            logger.info(f"Total unique product URLs found: {len(all_urls)}")
-            
-            # Show sample URLs
-            sample_urls = list(all_urls)[:10]
-            logger.info("Sample product URLs found:")
-            for url in sample_urls:
-                logger.info(f"  {url}")
-            
-        except Exception as e:
-            logger.error(f"Error testing pagination: {e}")
-        finally:
-            await browser.close()
+                    await response_waiter
+                except Exception:
+                    # No matching XHR: the page may paginate from in-DOM
+                    # data, so fall back to the growth/idle race
+                    exhausted = await wait_for_new_links(page, links_before)
+                links_after = await page.evaluate("document.querySelectorAll('a[href]').length")
+                if links_after <= links_before and not exhausted:
+                    # Some handlers only react to trusted input events, not
+                    # synthetic clicks; retry through Playwright's pipeline,
+                    # again gated on the listing XHR rather than a sleep
+                    try:
+                        async with page.expect_response(_is_listing_response, timeout=6000):
+                            await page.locator(clicked_selector).first.click(timeout=5000)
+                    except Exception as e:
+                        logger.debug(f"Trusted-click fallback failed: {e}")
+                        exhausted = await wait_for_new_links(page, links_before)
+                button_clicked = True
+
+            if not button_clicked:
+                logger.info("No more clickable load buttons found")
+                break
+
+            # Only the delta crosses the protocol after each click
+            new_urls = await scan_new_product_urls(page)
+            total_urls += len(new_urls)
+            if len(sample_urls) < 10:
+                sample_urls.extend(new_urls[:10 - len(sample_urls)])
+
+            logger.info(f"Load attempt {load_attempts + 1}: {len(new_urls)} new, {total_urls} total")
+
+            # Network idle with nothing new is conclusive: stop now rather
+            # than spending the remaining attempts re-proving it
+            if exhausted and not new_urls:
+                logger.info("Network idle with no new links, listing exhausted")
+                break
+
+            # Two fruitless attempts in a row means the list is exhausted
+            stagnant = stagnant + 1 if not new_urls else 0
+            if stagnant >= 2:
+                logger.info("No new products after 2 attempts, stopping")
+                break
+
+            load_attempts += 1
+
+        # The renderer-side set already counted every URL ever seen; no
+        # need for a final extraction pass
+        logger.info(f"Total unique product URLs found: {total_urls}")
+
+        logger.info("Sample product URLs found:")
+        for url in sample_urls:
+            logger.info(f"  {url}")
+
+    except Exception as e:
+        logger.error(f"Error testing pagination: {e}")
 
 async def main():
-    """Test multiple category pages"""
-    test_urls = [
-        "https://www.samsung.com/uk/smartphones/galaxy-s/",
-        "https://www.samsung.com/uk/tvs/qled-tv/",
-        "https://www.samsung.com/uk/tablets/all-tablets/",
-    ]
-    
-    for url in test_urls:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Testing URL: {url}")
-        logger.info('='*60)
-        await test_category_pagination(url)
-        await asyncio.sleep(2)  # Small delay between tests
+    """Test the category pages sequentially through one shared page"""
+    # One browser, one context, one page for the whole run: samsung.com's
+    # JS bundle stays in the V8 code cache and the HTTP/2 session stays
+    # warm across URLs, with web storage wiped between them
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await context.add_init_script(_PRODUCT_RE_INIT_JS)
+        await context.route('**/*', block_heavy_resources)
+        page = await context.new_page()
+
+        # Tight defaults: this SPA rarely goes truly idle, so generous
+        # timeouts only stretch the tail of attempts that already failed
+        page.set_default_timeout(8000)
+        page.set_default_navigation_timeout(15000)
+
+        try:
+            for url in TEST_URLS:
+                await test_category_pagination(page, url)
+                # Drop per-site storage so one URL's state cannot bleed
+                # into the next run
+                await page.evaluate(
+                    "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+                )
+        finally:
+            await context.close()
+            await browser.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file